@@ -0,0 +1,336 @@
+import functools
+import hashlib
+import itertools
+import logging
+import os
+import tempfile
+import threading
+import time
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor, as_completed
+
+import orjson
+import requests
+from dotenv import load_dotenv
+from requests.adapters import HTTPAdapter
+from urllib3.util import make_headers
+from urllib3.util.retry import Retry
+
+log = logging.getLogger(__name__)
+
+load_dotenv()  # Load environment variables from .env file
+# Collibra API details
+COLLIBRA_URL = os.getenv("COLLIBRA_URL")
+COLLIBRA_USERNAME = os.getenv("COLLIBRA_USERNAME")
+COLLIBRA_PASSWORD = os.getenv("COLLIBRA_PASSWORD")
+# Requests per second allowed against the Collibra REST API (fractions allowed, e.g. 0.5)
+COLLIBRA_RPS = float(os.getenv("COLLIBRA_RPS", 10))
+if COLLIBRA_RPS <= 0:
+    raise ValueError(f"COLLIBRA_RPS must be greater than 0, got {COLLIBRA_RPS}")
+# Seconds a cached response is served without contacting Collibra (0 disables the cache)
+COLLIBRA_CACHE_TTL = float(os.getenv("COLLIBRA_CACHE_TTL", 300))
+COLLIBRA_CACHE_DIR = os.path.join(os.path.expanduser("~"), ".cache", "collibra")
+# Number of pages requested in parallel once the total item count is known
+PAGE_CONCURRENCY = 16
+
+
+class RateLimiter:
+    """
+    A thread-safe token-bucket rate limiter.
+
+    Tokens refill continuously at `rate` per second up to `max_tokens`, so bursts
+    within the allowance run back-to-back and callers only wait once the bucket
+    is empty.
+    """
+
+    def __init__(self, rate, max_tokens):
+        """
+        Initializes the RateLimiter.
+
+        Args:
+            rate (float): Number of tokens added per second.
+            max_tokens (float): Capacity of the bucket, i.e. the largest allowed burst.
+        """
+        self.rate = rate
+        self.max_tokens = max_tokens
+        self.tokens = max_tokens
+        self.updated_at = time.monotonic()
+        self.lock = threading.Lock()
+
+    def acquire(self):
+        """
+        Blocks until a token is available and consumes it.
+        """
+        while True:
+            with self.lock:
+                now = time.monotonic()
+                self.tokens = min(self.max_tokens, self.tokens + (now - self.updated_at) * self.rate)
+                self.updated_at = now
+                if self.tokens >= 1:
+                    self.tokens -= 1
+                    return
+                wait = (1 - self.tokens) / self.rate
+            time.sleep(wait)
+
+
+@functools.lru_cache(maxsize=1)
+def get_session():
+    """
+    Returns the process-wide requests.Session used for all Collibra REST calls.
+
+    The session is created on first use and prewired with Basic Authentication,
+    JSON headers and a pooled HTTPAdapter, so keep-alive connections survive the
+    hand-off from the asset fetch to the relations fetch. Compressed responses are
+    requested for every encoding urllib3 can decode here (gzip and deflate, plus
+    br when the brotli package is installed).
+    """
+    session = requests.Session()
+    session.auth = (COLLIBRA_USERNAME, COLLIBRA_PASSWORD)
+    session.headers.update({
+        "Accept": "application/json",
+        "Content-Type": "application/json",
+    })
+    session.headers.update(make_headers(accept_encoding=True))
+    # All traffic goes to a single Collibra host: one pool holding one keep-alive
+    # socket per page worker. pool_block stops bursts from opening throwaway
+    # connections beyond that.
+    session.mount("https://", HTTPAdapter(
+        pool_connections=1,
+        pool_maxsize=PAGE_CONCURRENCY,
+        pool_block=True,
+        max_retries=Retry(total=3, backoff_factor=0.3, status_forcelist=[429, 500, 502, 503, 504]),
+    ))
+    return session
+
+
+@functools.lru_cache(maxsize=1)
+def get_rate_limiter():
+    """
+    Returns the process-wide RateLimiter shared by all Collibra REST calls.
+
+    The bucket holds at least one token, so a fractional rate still lets a
+    request through once a whole token has refilled.
+    """
+    return RateLimiter(rate=COLLIBRA_RPS, max_tokens=max(1.0, COLLIBRA_RPS))
+
+
+def _cache_path(endpoint, params):
+    """
+    Returns the cache file path for a request, keyed by its URL and query parameters.
+    """
+    key = hashlib.sha1(endpoint.encode("utf-8") + orjson.dumps(params, option=orjson.OPT_SORT_KEYS)).hexdigest()
+    return os.path.join(COLLIBRA_CACHE_DIR, f"{key}.json")
+
+
+def _write_cache(path, entry):
+    """
+    Atomically writes a cache entry so concurrent readers never see a partial file.
+
+    The cache is best-effort: if the entry cannot be written (e.g. a read-only
+    home directory) a warning is logged and the fetch carries on uncached.
+    """
+    tmp_path = None
+    try:
+        os.makedirs(COLLIBRA_CACHE_DIR, exist_ok=True)
+        fd, tmp_path = tempfile.mkstemp(dir=COLLIBRA_CACHE_DIR, suffix=".tmp")
+        with os.fdopen(fd, "wb") as f:
+            f.write(orjson.dumps(entry))
+        os.replace(tmp_path, path)
+    except OSError as e:
+        log.warning("Could not write the Collibra cache entry %s: %s", path, e)
+        if tmp_path is not None:
+            try:
+                os.remove(tmp_path)
+            except OSError:
+                pass
+
+
+def get_json(endpoint, params, cache=False, session=None):
+    """
+    Performs a rate-limited GET against Collibra and returns the decoded JSON body.
+
+    When `cache` is True the body is stored on disk under COLLIBRA_CACHE_DIR. Entries
+    younger than COLLIBRA_CACHE_TTL seconds are returned without any network call;
+    older entries are revalidated with If-None-Match / If-Modified-Since when the
+    server supplied an ETag or Last-Modified header, and a 304 is treated as a hit.
+
+    Args:
+        endpoint (str): The REST endpoint URL.
+        params (dict): The query parameters of the request.
+        cache (bool): Whether to serve and store the response through the disk cache.
+        session (requests.Session): The session to send the request on. Defaults to
+            the shared session from get_session().
+
+    Returns:
+        dict: The decoded JSON body.
+    """
+    use_cache = cache and COLLIBRA_CACHE_TTL > 0
+    path = _cache_path(endpoint, params) if use_cache else None
+    entry = None
+    headers = {}
+
+    if use_cache and os.path.exists(path):
+        try:
+            with open(path, "rb") as f:
+                entry = orjson.loads(f.read())
+        except (OSError, orjson.JSONDecodeError):
+            entry = None
+        if entry is not None:
+            if time.time() - os.path.getmtime(path) < COLLIBRA_CACHE_TTL:
+                return entry["data"]
+            if entry.get("etag"):
+                headers["If-None-Match"] = entry["etag"]
+            if entry.get("last_modified"):
+                headers["If-Modified-Since"] = entry["last_modified"]
+
+    get_rate_limiter().acquire()
+    response = (session or get_session()).get(endpoint, params=params, headers=headers)
+
+    if response.status_code == 304 and entry is not None:
+        try:
+            os.utime(path)  # Revalidated: restart the TTL window
+        except OSError as e:
+            log.warning("Could not refresh the Collibra cache entry %s: %s", path, e)
+        return entry["data"]
+
+    response.raise_for_status()  # Raise an exception for HTTP errors (4xx or 5xx)
+    data = orjson.loads(response.content)  # Much faster than response.json() on large pages
+
+    if use_cache:
+        _write_cache(path, {
+            "etag": response.headers.get("ETag"),
+            "last_modified": response.headers.get("Last-Modified"),
+            "data": data,
+        })
+    return data
+
+
+def fetch_page(endpoint, params, offset, limit, cache=False, session=None):
+    """
+    Fetches a single page from a paginated Collibra endpoint.
+
+    Args:
+        endpoint (str): The REST endpoint URL.
+        params (dict): Query parameters shared by every page (e.g. filters).
+        offset (int): The offset of the first item in the page.
+        limit (int): The page size.
+        cache (bool): Whether to serve the page through the disk cache.
+        session (requests.Session): The session to send the request on.
+
+    Returns:
+        dict: The decoded JSON body of the page.
+    """
+    return get_json(endpoint, {**params, "offset": offset, "limit": limit}, cache=cache, session=session)
+
+
+def _fetch_page_results(endpoint, params, offset, limit, cache=False, session=None):
+    """
+    Fetches a page and keeps only its 'results', so the page envelope is
+    released inside the worker thread.
+    """
+    return fetch_page(endpoint, params, offset, limit, cache, session).get("results", [])
+
+
+def fetch_all_pages(endpoint, params, first_page, limit, concurrency=PAGE_CONCURRENCY, cache=False, session=None):
+    """
+    Completes a paginated fetch whose first page has already been retrieved.
+
+    The output list is allocated once from the `total` reported by the first page
+    and every page is written into its slot by slice assignment as soon as it
+    arrives, so pages can complete in any order without intermediate buffers.
+    The remaining pages are dispatched through a bounded thread pool over the
+    shared session. An empty or short page marks the end of the data (e.g. when
+    `total` was stale): later pages are cancelled if they have not started yet
+    and the output is truncated after the last item received.
+
+    Args:
+        endpoint (str): The REST endpoint URL.
+        params (dict): Query parameters shared by every page (e.g. filters).
+        first_page (dict): The decoded body of the page at offset 0.
+        limit (int): The page size.
+        concurrency (int): Maximum number of pages in flight at once.
+        cache (bool): Whether to serve the pages through the disk cache.
+        session (requests.Session): The session shared by all page requests.
+
+    Returns:
+        list: The 'results' of all pages, in offset order.
+    """
+    first_results = first_page.get("results", [])
+    total = first_page.get("total", 0)
+
+    # A short first page means there is nothing left to fetch, whatever 'total' says
+    if len(first_results) < limit or total <= limit:
+        return list(first_results)
+
+    results = [None] * total
+    results[:limit] = first_results
+    end = total
+
+    with ThreadPoolExecutor(max_workers=concurrency) as executor:
+        futures = {
+            executor.submit(_fetch_page_results, endpoint, params, offset, limit, cache, session): offset
+            for offset in range(limit, total, limit)
+        }
+        for future in as_completed(futures):
+            offset = futures[future]
+            if offset >= end:
+                continue  # Past the end of the data (or cancelled)
+            page = future.result()
+            results[offset:offset + len(page)] = page
+            if len(page) < limit:
+                end = offset + len(page)
+                for other, other_offset in futures.items():
+                    if other_offset > offset:
+                        other.cancel()
+
+    del results[end:]
+    return results
+
+
+def iter_all_pages(endpoint, params, limit, concurrency=PAGE_CONCURRENCY, cache=False, session=None):
+    """
+    Yields the items of a paginated endpoint one at a time, in offset order.
+
+    Unlike fetch_all_pages the result list is never materialized: after the first
+    page, at most `concurrency` pages are requested ahead of the consumer through
+    a bounded thread pool, so only that window of pages is held in memory. An
+    empty or short page marks the end of the data and cancels the pages after it.
+
+    Args:
+        endpoint (str): The REST endpoint URL.
+        params (dict): Query parameters shared by every page (e.g. filters).
+        limit (int): The page size.
+        concurrency (int): Maximum number of pages requested ahead of the consumer.
+        cache (bool): Whether to serve the pages through the disk cache.
+        session (requests.Session): The session shared by all page requests.
+
+    Yields:
+        dict: The items of every page's 'results'.
+    """
+    first_page = fetch_page(endpoint, params, 0, limit, cache, session)
+    first_results = first_page.get("results", [])
+    total = first_page.get("total", 0)
+    yield from first_results
+    if len(first_results) < limit or total <= limit:
+        return
+    del first_page, first_results
+
+    offsets = iter(range(limit, total, limit))
+    with ThreadPoolExecutor(max_workers=concurrency) as executor:
+        window = deque(
+            executor.submit(_fetch_page_results, endpoint, params, offset, limit, cache, session)
+            for offset in itertools.islice(offsets, concurrency)
+        )
+        try:
+            while window:
+                page = window.popleft().result()
+                yield from page
+                if len(page) < limit:
+                    break  # Past the end of the data
+                offset = next(offsets, None)
+                if offset is not None:
+                    window.append(executor.submit(_fetch_page_results, endpoint, params, offset, limit, cache, session))
+        finally:
+            # Also reached when the consumer stops early
+            for future in window:
+                future.cancel()
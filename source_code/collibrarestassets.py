@@ -1,61 +1,77 @@
+import orjson
 import requests
-import json
-from dotenv import load_dotenv
-import os
+from collibra_client import COLLIBRA_URL, PAGE_CONCURRENCY, fetch_all_pages, fetch_page, iter_all_pages
 
-load_dotenv()  # Load environment variables from .env file
-# Collibra API details
-COLLIBRA_URL = os.getenv("COLLIBRA_URL")
-COLLIBRA_USERNAME = os.getenv("COLLIBRA_USERNAME")
-COLLIBRA_PASSWORD = os.getenv("COLLIBRA_PASSWORD")
+ASSETS_ENDPOINT = f"{COLLIBRA_URL}/rest/2.0/assets"
 
-def get_all_collibra_assets_basic_auth():
+def get_all_collibra_assets_basic_auth(session=None):
     """
     Connects to Collibra using Basic Authentication and retrieves all assets.
+
+    The first page is fetched synchronously to learn the total asset count; the
+    remaining pages are then requested concurrently over the pooled session and
+    concatenated in offset order.
+
+    Args:
+        session (requests.Session): The session to fetch the pages on. Defaults to
+            the shared, connection-pooled session from collibra_client.get_session().
     """
     assets = []
-    offset = 0
     limit = 100  # Max limit per request, adjust based on Collibra's documentation
 
-    headers = {
-        "Accept": "application/json",
-        "Content-Type": "application/json",
-    }
-
     print("Connecting to Collibra with Basic Authentication...")
 
-    while True:
-        # Construct the API URL with pagination parameters
-        api_url = f"{COLLIBRA_URL}/rest/2.0/assets?offset={offset}&limit={limit}"
-        print(f"Fetching assets from: {api_url}")
-        
-        try:
-            response = requests.get(api_url, headers=headers, auth=(COLLIBRA_USERNAME, COLLIBRA_PASSWORD))
-            response.raise_for_status()  # Raise an exception for HTTP errors (4xx or 5xx)
+    try:
+        data = fetch_page(ASSETS_ENDPOINT, {}, 0, limit, session=session)
+        total = data.get("total", 0)
+        print(f"Retrieved {len(data.get('results', []))} of {total} assets...")
 
-            data = response.json()
-            current_assets = data.get("results", [])
-            total = data.get("total", 0)
+        if total > limit:
+            print(f"Fetching remaining pages with {PAGE_CONCURRENCY} workers...")
+        assets = fetch_all_pages(ASSETS_ENDPOINT, {}, data, limit, session=session)
+        print(f"Retrieved {len(assets)} of {total} assets...")
 
-            assets.extend(current_assets)
+    except requests.exceptions.RequestException as e:
+        print(f"Error connecting to Collibra: {e}")
+        if e.response is not None:
+            print(f"Response content: {e.response.text}")
+    except orjson.JSONDecodeError as e:
+        print(f"Error decoding JSON from response: {e}")
 
-            print(f"Retrieved {len(assets)} of {total} assets...")
+    print(f"Successfully retrieved {len(assets)} assets.")
+    return assets
 
-            if len(assets) >= total:
-                break  # All assets retrieved
-            else:
-                offset += len(current_assets)
+def iter_collibra_assets(session=None):
+    """
+    Connects to Collibra using Basic Authentication and yields all assets one at a time.
 
-        except requests.exceptions.RequestException as e:
-            print(f"Error connecting to Collibra: {e}")
-            print(f"Response content: {response.text}")
-            break
-        except json.JSONDecodeError:
-            print(f"Error decoding JSON from response: {response.text}")
-            break
+    Streaming counterpart of get_all_collibra_assets_basic_auth: pages are fetched
+    a bounded window ahead of the consumer, so only a few pages of assets are in
+    memory at once. On a connection or decoding error the error is printed and
+    iteration stops after the assets yielded so far.
 
-    print(f"Successfully retrieved {len(assets)} assets.")
-    return assets
+    Args:
+        session (requests.Session): The session to fetch the pages on. Defaults to
+            the shared, connection-pooled session from collibra_client.get_session().
+    """
+    limit = 100  # Max limit per request, adjust based on Collibra's documentation
+    count = 0
+
+    print("Connecting to Collibra with Basic Authentication...")
+
+    try:
+        for asset in iter_all_pages(ASSETS_ENDPOINT, {}, limit, session=session):
+            count += 1
+            yield asset
+
+    except requests.exceptions.RequestException as e:
+        print(f"Error connecting to Collibra: {e}")
+        if e.response is not None:
+            print(f"Response content: {e.response.text}")
+    except orjson.JSONDecodeError as e:
+        print(f"Error decoding JSON from response: {e}")
+
+    print(f"Successfully retrieved {count} assets.")
 
 if __name__ == "__main__":
     all_assets = get_all_collibra_assets_basic_auth()
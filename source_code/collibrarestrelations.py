@@ -1,127 +1,137 @@
-import requests
-import json
-import time
+import logging
 import os
-from dotenv import load_dotenv
 
-load_dotenv()  # Load environment variables from .env file
-# Collibra API details
-COLLIBRA_URL = os.getenv("COLLIBRA_URL")
-COLLIBRA_USERNAME = os.getenv("COLLIBRA_USERNAME")
-COLLIBRA_PASSWORD = os.getenv("COLLIBRA_PASSWORD")
+import orjson
+import requests
+from collibra_client import COLLIBRA_URL, fetch_all_pages, fetch_page, iter_all_pages
 
 # The id of the asset to retrieve relations for
 COLLIBRA_ASSET_ID = os.getenv("COLLIBRA_ASSET_ID")
 
-# --- Authentication ---
-# For Basic Authentication (replace with your chosen method)
-auth = (COLLIBRA_USERNAME, COLLIBRA_PASSWORD)
-headers = {
-    "Accept": "application/json",
-    "Content-Type": "application/json",
-}
+ASSETS_ENDPOINT = f"{COLLIBRA_URL}/rest/2.0/assets"
+RELATIONS_ENDPOINT = f"{COLLIBRA_URL}/rest/2.0/relations"
+
+log = logging.getLogger(__name__)
 
 # --- Generic Pagination Function ---
-def get_paginated_data(endpoint, params):
+def get_paginated_data(endpoint, params, session=None):
     """
     Fetches all data from a paginated API endpoint.
+
+    The first page is fetched to learn the total item count; the remaining
+    pages are then fetched concurrently and returned in offset order. Pages are
+    cached on disk, so repeated runs within the TTL skip the network entirely.
     """
-    all_results = []
-    total = 1  # Initialize total to enter the loop
-    offset = 0
     limit = 1000  # A good default for many APIs
 
     print(f"Fetching data from: {endpoint}...")
 
-    while len(all_results) < total:
-        # Update the offset for the current page
-        params['offset'] = offset
-        params['limit'] = limit
-
-        try:
-            # response = requests.get(endpoint, auth=auth, headers=headers, params=params)
-            response = requests.get(endpoint, auth=auth, headers=headers)
-            response.raise_for_status()  # Raise an exception for bad status codes
-            print("response:", response.json())
-            data = response.json()
-            
-            # Update total from the first response
-            if offset == 0:
-                total = data.get('total', 0)
-                print(f"Total items to fetch: {total}")
-            
-            results = data.get('results', [])
-            all_results.extend(results)
-            
-            print(f"  -> Fetched {len(results)} items. Total fetched: {len(all_results)} / {total}")
-            
-            offset += len(results)
-            
-            # Optional: Add a small delay to avoid hitting rate limits
-            time.sleep(0.5)
-
-        except requests.exceptions.RequestException as e:
-            print(f"Error fetching data from {endpoint}: {e}")
-            return []
-    
+    try:
+        # Pages are served from the on-disk cache while younger than COLLIBRA_CACHE_TTL
+        data = fetch_page(endpoint, params, 0, limit, cache=True, session=session)
+        log.debug("First page from %s: %d results", endpoint, len(data.get('results', [])))
+
+        total = data.get('total', 0)
+        print(f"Total items to fetch: {total}")
+
+        # The result list is pre-sized from 'total' and filled page by page
+        all_results = fetch_all_pages(endpoint, params, data, limit, cache=True, session=session)
+        print(f"  -> Fetched {len(all_results)} items. Total fetched: {len(all_results)} / {total}")
+
+    except (requests.exceptions.RequestException, orjson.JSONDecodeError) as e:
+        print(f"Error fetching data from {endpoint}: {e}")
+        return []
+
     return all_results
 
+def iter_paginated_data(endpoint, params, session=None):
+    """
+    Yields all items of a paginated API endpoint one at a time.
+
+    Streaming counterpart of get_paginated_data: only a bounded window of pages is
+    held in memory. On an error the error is printed and iteration stops.
+    """
+    limit = 1000  # A good default for many APIs
+
+    print(f"Fetching data from: {endpoint}...")
+
+    try:
+        # Pages are served from the on-disk cache while younger than COLLIBRA_CACHE_TTL
+        yield from iter_all_pages(endpoint, params, limit, cache=True, session=session)
+    except (requests.exceptions.RequestException, orjson.JSONDecodeError) as e:
+        print(f"Error fetching data from {endpoint}: {e}")
+
 # --- API Endpoints ---
-def get_assets_by_type(asset_type_id):
+def get_assets_by_type(asset_type_id, session=None):
     """
     Fetches all assets of a given type, using pagination.
     """
-    endpoint = f"{COLLIBRA_URL}/rest/2.0/assets"
     params = {
         "typeId": asset_type_id
     }
-    return get_paginated_data(endpoint, params)
+    return get_paginated_data(ASSETS_ENDPOINT, params, session)
 
-def get_asset_relations(asset_id):
+def get_asset_relations(asset_id, session=None):
     """
     Fetches all relations for a specific asset, using pagination.
     """
-    endpoint = f"{COLLIBRA_URL}/rest/2.0/relations"
     params = {
         "sourceId": asset_id
     }
-    return get_paginated_data(endpoint, params)
+    return get_paginated_data(RELATIONS_ENDPOINT, params, session)
 
+def iter_asset_relations(asset_id, session=None):
+    """
+    Yields all relations for a specific asset, page by page.
+    """
+    params = {
+        "sourceId": asset_id
+    }
+    return iter_paginated_data(RELATIONS_ENDPOINT, params, session)
 
-def get_all_collibra_relations():
-    asset_relationships = {}
-    # for i, asset in enumerate(assets):
-    #     asset_id = asset['id']
-    #     asset_name = asset['name']
-        
-    #     print(f"Processing asset {i+1}/{len(assets)}: {asset_name}")
-    
+
+def get_all_collibra_relations(session=None):
+    """
+    Fetches the relations of COLLIBRA_ASSET_ID as source/target/type id triples,
+    with the resource types of the source and target (their partition key values).
+    """
     asset_id = COLLIBRA_ASSET_ID
-    relations = get_asset_relations(asset_id)
-    asset_relationships = []
-
-    if relations:
-        # You might want to save this data more cleanly.
-        # For this example, we'll just store the IDs.
-        # asset_relationships[asset_name] = []
-        for i, rel in enumerate(relations):
-            print("rel:", rel)
-            relation_id = rel['id']
-            source_asset_id = rel['source']['id']
-            target_asset_id = rel['target']['id']
-            relation_type_id = rel['type']['id']
-            print(f"  Relation from {source_asset_id} to {target_asset_id} of type {relation_type_id}")
-            # Store the relationship in a dictionary
-            print("i:", i)
-            asset_relationships.append({
-                "source_id": source_asset_id,
-                "target_id": target_asset_id,
-                "relation_type_id": relation_type_id
-            })
-    
-    print("asset_relationships:", asset_relationships)
+    relations = get_asset_relations(asset_id, session)
+
+    # You might want to save this data more cleanly.
+    # For this example, we'll just store the IDs.
+    asset_relationships = [
+        {
+            "source_id": rel["source"]["id"],
+            "target_id": rel["target"]["id"],
+            "relation_type_id": rel["type"]["id"],
+            "source_resource_type": rel["source"].get("resourceType"),
+            "target_resource_type": rel["target"].get("resourceType"),
+        }
+        for rel in relations
+    ]
+
+    if log.isEnabledFor(logging.DEBUG):
+        for rel in asset_relationships:
+            log.debug("  Relation from %s to %s of type %s", rel["source_id"], rel["target_id"], rel["relation_type_id"])
     return asset_relationships
 
+
+def iter_collibra_relations(session=None):
+    """
+    Yields the relations of COLLIBRA_ASSET_ID as source/target/type id triples,
+    with the resource types of the source and target, one at a time.
+    """
+    for rel in iter_asset_relations(COLLIBRA_ASSET_ID, session):
+        log.debug("  Relation from %s to %s of type %s", rel["source"]["id"], rel["target"]["id"], rel["type"]["id"])
+        yield {
+            "source_id": rel["source"]["id"],
+            "target_id": rel["target"]["id"],
+            "relation_type_id": rel["type"]["id"],
+            "source_resource_type": rel["source"].get("resourceType"),
+            "target_resource_type": rel["target"].get("resourceType"),
+        }
+
     
 # --- Main Script ---
 if __name__ == "__main__":
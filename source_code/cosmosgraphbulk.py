@@ -0,0 +1,221 @@
+import asyncio
+import logging
+import uuid
+from azure.cosmos import exceptions
+from azure.cosmos.aio import CosmosClient
+
+log = logging.getLogger(__name__)
+
+# Maximum number of operations Cosmos DB accepts in one transactional batch
+TRANSACTIONAL_BATCH_LIMIT = 100
+# Default number of transactional batches in flight at once
+DEFAULT_CONCURRENCY = 16
+
+# Gremlin and document (SQL) endpoints share the account name
+_GREMLIN_HOST_SUFFIX = ".gremlin.cosmos.azure.com"
+_DOCUMENT_ENDPOINT_TEMPLATE = "https://{account}.documents.azure.com:443/"
+
+
+def document_endpoint(gremlin_hostname):
+    """
+    Derives the document (SQL) endpoint URL of an account from its Gremlin hostname.
+
+    Args:
+        gremlin_hostname (str): e.g. '<account>.gremlin.cosmos.azure.com'.
+
+    Returns:
+        str: e.g. 'https://<account>.documents.azure.com:443/'.
+    """
+    if not gremlin_hostname.endswith(_GREMLIN_HOST_SUFFIX):
+        raise ValueError(f"Cannot derive the document endpoint from '{gremlin_hostname}'; set COSMOS_DB_ENDPOINT.")
+    return _DOCUMENT_ENDPOINT_TEMPLATE.format(account=gremlin_hostname[:-len(_GREMLIN_HOST_SUFFIX)])
+
+
+def vertex_document(label, id_value, properties, partition_key_field, partition_key_value):
+    """
+    Builds the stored document of a vertex, as the Gremlin API would write it.
+
+    Vertex properties are stored as lists of {'id', '_value'} entries; the id and
+    the partition key are plain top-level fields. None values are skipped, like in
+    CosmosGraphClient.
+
+    Args:
+        label (str): The vertex label.
+        id_value (str): The vertex id.
+        properties (dict): The vertex properties.
+        partition_key_field (str): The partition key path of the graph (without '/').
+        partition_key_value (str): The partition key value of the vertex.
+
+    Returns:
+        dict: The vertex document.
+    """
+    document = {'id': str(id_value), 'label': label, partition_key_field: partition_key_value}
+    for key, value in properties.items():
+        if value is None or key in document:
+            continue
+        document[key] = [{'id': str(uuid.uuid4()), '_value': value}]
+    return document
+
+
+def edge_document(label, out_vertex, in_vertex, partition_key_field, properties=None):
+    """
+    Builds the stored document of an edge, as the Gremlin API would write it.
+
+    An edge lives in the partition of its out-vertex. Its id is derived from the
+    two vertex ids and the label, so loading the same edge twice overwrites it
+    instead of creating a duplicate.
+
+    Args:
+        label (str): The edge label.
+        out_vertex (tuple): (id, label, partition key value) of the vertex the edge starts at.
+        in_vertex (tuple): (id, label, partition key value) of the vertex the edge points to.
+        partition_key_field (str): The partition key path of the graph (without '/').
+        properties (dict, optional): The edge properties.
+
+    Returns:
+        dict: The edge document.
+    """
+    out_id, out_label, out_pk = out_vertex
+    in_id, in_label, in_pk = in_vertex
+    document = {
+        'id': str(uuid.uuid5(uuid.NAMESPACE_URL, f"{out_id}/{label}/{in_id}")),
+        'label': label,
+        '_isEdge': True,
+        '_vertexId': out_id,
+        '_vertexLabel': out_label,
+        '_sink': in_id,
+        '_sinkLabel': in_label,
+        '_sinkPartition': in_pk,
+        partition_key_field: out_pk,
+    }
+    if properties:
+        document.update((key, value) for key, value in properties.items() if value is not None and key not in document)
+    return document
+
+
+class CosmosGraphBulkWriter:
+    """
+    Writes graph vertices and edges straight to the document (SQL) endpoint of a
+    Cosmos DB Gremlin account, bypassing Gremlin parsing.
+
+    Documents are buffered per partition key and upserted in transactional
+    batches of up to TRANSACTIONAL_BATCH_LIMIT operations, with at most
+    `concurrency` batches in flight. Throttled (429) batches are retried by the
+    Cosmos SDK. Meant for initial loads; use CosmosGraphClient for queries.
+
+    Usage:
+        async with CosmosGraphBulkWriter(endpoint, key, database, collection, 'pk') as writer:
+            await writer.add_vertex('person', '1', {'name': 'Alice'}, 'person')
+    """
+
+    def __init__(self, endpoint, key, database_name, collection_name, partition_key_field,
+                 concurrency=DEFAULT_CONCURRENCY, batch_size=TRANSACTIONAL_BATCH_LIMIT):
+        """
+        Initializes the CosmosGraphBulkWriter.
+
+        Args:
+            endpoint (str): The document endpoint URL (see document_endpoint()).
+            key (str): A primary or secondary key of the account.
+            database_name (str): The name of the Cosmos DB database.
+            collection_name (str): The name of the graph collection.
+            partition_key_field (str): The partition key path of the graph (without '/').
+            concurrency (int): Maximum number of transactional batches in flight (default is 16).
+            batch_size (int): Documents per transactional batch (default and maximum is 100).
+        """
+        self.endpoint = endpoint
+        self.key = key
+        self.database_name = database_name
+        self.collection_name = collection_name
+        self.partition_key_field = partition_key_field
+        self.concurrency = concurrency
+        self.batch_size = min(batch_size, TRANSACTIONAL_BATCH_LIMIT)
+        self.written = 0
+        self.failed = 0
+        self._cosmos_client = None
+        self._container = None
+        self._slots = None # Created in __aenter__: before Python 3.10 it binds to the running loop
+        self._buffers = {} # partition key value -> documents not yet sent
+        self._tasks = set()
+
+    async def __aenter__(self):
+        self._slots = asyncio.Semaphore(self.concurrency)
+        self._cosmos_client = CosmosClient(self.endpoint, credential=self.key)
+        database = self._cosmos_client.get_database_client(self.database_name)
+        self._container = database.get_container_client(self.collection_name)
+        return self
+
+    async def __aexit__(self, exc_type, exc, tb):
+        try:
+            if exc_type is None:
+                await self.flush()
+        finally:
+            await self._cosmos_client.close()
+            self._cosmos_client = None
+            self._container = None
+
+    async def add_vertex(self, label, id_value, properties, partition_key_value):
+        """
+        Queues the upsert of a vertex (see vertex_document()).
+        """
+        await self._add(vertex_document(label, id_value, properties, self.partition_key_field, partition_key_value),
+                        partition_key_value)
+
+    async def add_edge(self, label, out_vertex, in_vertex, properties=None):
+        """
+        Queues the upsert of an edge (see edge_document()).
+        """
+        await self._add(edge_document(label, out_vertex, in_vertex, self.partition_key_field, properties),
+                        out_vertex[2])
+
+    async def _add(self, document, partition_key_value):
+        """
+        Buffers a document and sends its partition's buffer once it is a full batch.
+        """
+        buffer = self._buffers.setdefault(partition_key_value, [])
+        buffer.append(document)
+        if len(buffer) >= self.batch_size:
+            del self._buffers[partition_key_value]
+            await self._dispatch(partition_key_value, buffer)
+
+    async def _dispatch(self, partition_key_value, documents):
+        """
+        Starts a transactional batch, waiting first while `concurrency` batches are in flight.
+        """
+        await self._slots.acquire()
+        task = asyncio.ensure_future(self._execute_batch(partition_key_value, documents))
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+
+    async def _execute_batch(self, partition_key_value, documents):
+        """
+        Upserts the documents of one partition in a single transactional batch.
+        """
+        try:
+            await self._container.execute_item_batch(
+                [("upsert", (document,)) for document in documents],
+                partition_key=partition_key_value,
+            )
+            self.written += len(documents)
+            log.debug("Upserted %d documents in partition %s", len(documents), partition_key_value)
+        except (exceptions.CosmosHttpResponseError, exceptions.CosmosBatchOperationError) as e:
+            # A failed operation rolls the whole batch back
+            self.failed += len(documents)
+            log.error("Transactional batch of %d documents in partition %s failed: %s",
+                      len(documents), partition_key_value, e)
+        except Exception as e:
+            # Also counted: the task is discarded when done, so nothing else would report it
+            self.failed += len(documents)
+            log.error("An unexpected error occurred in a transactional batch of %d documents in partition %s: %s",
+                      len(documents), partition_key_value, e)
+        finally:
+            self._slots.release()
+
+    async def flush(self):
+        """
+        Sends every buffered document and waits for all batches in flight.
+        """
+        buffers, self._buffers = self._buffers, {}
+        for partition_key_value, documents in buffers.items():
+            await self._dispatch(partition_key_value, documents)
+        if self._tasks:
+            await asyncio.gather(*self._tasks)
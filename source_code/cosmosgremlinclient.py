@@ -1,4 +1,12 @@
+import asyncio
+import logging
+import operator
 import os
+import random
+import time
+import warnings
+from collections import OrderedDict, deque
+from contextlib import contextmanager
 from gremlin_python.driver import client, serializer
 from gremlin_python.driver.protocol import GremlinServerError
 from gremlin_python.process.anonymous_traversal import traversal
@@ -6,6 +14,43 @@ from gremlin_python.process.graph_traversal import __
 from gremlin_python.driver.driver_remote_connection import DriverRemoteConnection
 from gremlin_python.process.traversal import T
 
+log = logging.getLogger(__name__)
+
+# Default port of the Cosmos DB Gremlin endpoint
+DEFAULT_PORT = 443
+# GraphSON v2 is the only wire format the Cosmos DB Gremlin endpoint accepts
+DEFAULT_SERIALIZER = serializer.GraphSONSerializersV2d0
+# Using 'wss://' implicitly enables SSL
+_URL_TEMPLATE = "wss://{hostname}:{port}/gremlin"
+# Cosmos DB expects the username in the format /dbs/<database>/colls/<collection>
+_USERNAME_TEMPLATE = "/dbs/{database}/colls/{collection}"
+
+# Maximum number of property shapes whose .property() fragments are kept by _format_properties
+_SHAPE_CACHE_SIZE = 1024
+
+# Backslashes and single quotes escaped for use inside a '...' Gremlin string literal
+_ESCAPE_TABLE = str.maketrans({"'": "\\'", "\\": "\\\\"})
+
+
+def _parse_retry_after(value):
+    """
+    Converts a Cosmos DB x-ms-retry-after-ms value to seconds.
+
+    Cosmos sends either a number of milliseconds or a .NET TimeSpan string such
+    as '00:00:00.2730000'. Returns None if the value is missing or unparseable.
+    """
+    if value is None:
+        return None
+    try:
+        return float(value) / 1000
+    except (TypeError, ValueError):
+        pass
+    try:
+        hours, minutes, seconds = str(value).split(":")
+        return int(hours) * 3600 + int(minutes) * 60 + float(seconds)
+    except ValueError:
+        return None
+
 class CosmosGraphClient:
     """
     A synchronous client for connecting to Azure Cosmos DB Graph API
@@ -15,11 +60,26 @@ class CosmosGraphClient:
     - Establish and close a connection to the graph database.
     - Create new vertices with specified labels and properties.
     - Create new edges between existing vertices with specified labels and properties.
+    - Upsert vertices and create edges in bulk, many objects per traversal.
+    - Look up vertices by a unique property, with an LRU cache of recent hits.
     - Run arbitrary Gremlin queries.
     """
 
-    def __init__(self, hostname, port=443, database_name="", collection_name="", password="",
-                 traversal_source='g', enable_ssl=True, partition_key_field=""):
+    # Clients are created per script/test; slots drop the per-instance __dict__
+    __slots__ = (
+        'hostname', 'port', 'database_name', 'collection_name', 'password', 'traversal_source',
+        'enable_ssl', 'partition_key_field', 'pool_size', 'max_workers', 'serializer_cls',
+        'max_retries', 'base_backoff_s', 'transport_factory', 'gremlin_client',
+        '_submit', '_submit_async', '_connection', '_g', '_serializer', '_pending',
+        '_vertex_cache', '_vertex_cache_size', '_cache_hits', '_cache_misses',
+        '_pk_key', '_df_template_cache', '_shape_cache', '_throttled_until',
+    )
+
+    def __init__(self, hostname, port=DEFAULT_PORT, database_name="", collection_name="", password="",
+                 traversal_source='g', enable_ssl=True, partition_key_field="",
+                 pool_size=None, max_workers=None, vertex_cache_size=10_000, verbose=False,
+                 serializer_cls=DEFAULT_SERIALIZER, max_retries=5, base_backoff_s=0.5,
+                 transport_factory=None):
         """
         Initializes the CosmosGraphClient.
 
@@ -34,7 +94,35 @@ class CosmosGraphClient:
             enable_ssl (bool): Whether to enable SSL for the connection (default is True).
                                Note: This parameter is kept for consistency but SSL is
                                      implicitly handled by 'wss://' in the URL.
+            pool_size (int, optional): Number of WebSocket connections the Gremlin client keeps
+                                       open. Each in-flight request leases one connection, so
+                                       this caps how many queries run concurrently; further
+                                       requests wait for a free connection. Defaults to the
+                                       gremlin_python default (4).
+            max_workers (int, optional): Size of the driver's thread pool that services those
+                                         connections. Defaults to the gremlin_python default.
+            vertex_cache_size (int): Maximum number of vertices kept in the find_vertex LRU
+                                     cache (default is 10,000; 0 disables caching).
+            verbose (bool): If True, sets this module's logger to DEBUG so every query and
+                            connection event is logged (default is False; messages are
+                            otherwise only emitted if logging is configured for DEBUG).
+            serializer_cls (type): Message serializer class used for both connections (default
+                                   is GraphSONSerializersV2d0, the only wire format the Cosmos DB
+                                   Gremlin endpoint accepts). Other TinkerPop servers can pass
+                                   serializer.GraphBinarySerializersV1 for smaller, faster frames.
+            max_retries (int): How many times a throttled (429) request is retried before the
+                               error is reported (default is 5).
+            base_backoff_s (float): Backoff in seconds before the first retry when Cosmos DB
+                                    does not send x-ms-retry-after-ms; doubled on each attempt
+                                    (default is 0.5).
+            transport_factory (callable, optional): Factory for the WebSocket transport, passed
+                                                    through to gremlin_python (e.g. to plug in a
+                                                    different transport). Defaults to the driver's
+                                                    own transport.
         """
+        if verbose:
+            log.setLevel(logging.DEBUG)
+
         self.hostname = hostname
         self.port = port
         self.database_name = database_name
@@ -43,96 +131,179 @@ class CosmosGraphClient:
         self.traversal_source = traversal_source
         self.enable_ssl = enable_ssl # Kept for __init__ signature, but not directly used in client init
         self.gremlin_client = None
-        self.connection = None
-        self.g = None # Traversal object
+        self._submit = None # gremlin_client.submit, bound once in connect()
+        self._submit_async = None # gremlin_client.submitAsync, bound once in connect()
+        self._connection = None # DriverRemoteConnection, opened on first use of self.g
+        self._g = None # Traversal object, see the g property
         self.partition_key_field = partition_key_field
+        self.pool_size = pool_size
+        self.max_workers = max_workers
+        self.serializer_cls = serializer_cls
+        self.max_retries = max_retries
+        self.base_backoff_s = base_backoff_s
+        self.transport_factory = transport_factory
+        self._serializer = None # One serializer instance shared by both connections
+        self._throttled_until = 0.0 # time.monotonic() before which no request is sent after a 429
+        self._pending = None # Buffered vertex/edge specs while a batch() block is active
+        # LRU cache of found vertices keyed by (label, unique_property_name, unique_property_value,
+        # partition_key_value); None as the partition key value marks a cross-partition lookup
+        self._vertex_cache = OrderedDict()
+        self._vertex_cache_size = vertex_cache_size
+        self._cache_hits = 0
+        self._cache_misses = 0
+        self._pk_key = self._escape_gremlin_string(partition_key_field) # Escaped once for every query
+        self._df_template_cache = {} # (label, columns, rows) -> (query, binding names per row)
+        self._shape_cache = {} # (property keys, first binding index) -> (fragment, binding names)
+
+        log.debug("Initializing CosmosGraphClient for %s:%s", self.hostname, self.port)
+
+    @staticmethod
+    def _bind(bindings, value):
+        """
+        Registers a value in a bindings dict and returns its generated parameter name.
 
-        print(f"Initializing CosmosGraphClient for {self.hostname}:{self.port}")
+        Names are assigned in order (p0, p1, ...), so queries built from the same
+        shape always produce the same text and can hit the server's query cache.
+        """
+        name = f"p{len(bindings)}"
+        bindings[name] = value
+        return name
 
-    def _format_properties(self, properties):
+    def _format_properties(self, properties, bindings=None):
         """
-        Helper method to format a dictionary of properties into a Gremlin string
-        suitable for .property() steps.
+        Helper method to format a dictionary of properties into Gremlin .property()
+        steps whose values are passed as parameter bindings.
+
+        Bound values keep their type on the wire (GraphSON encodes ints, floats and
+        booleans natively), so nothing is stringified for the server to parse back.
+        Properties whose value is None are skipped, as Gremlin cannot store a null
+        property value.
+
+        Ingest writes the same few property sets over and over, so the fragment and
+        binding names are cached per shape (the property keys and the index of the
+        first binding). A repeated shape only needs its values added to `bindings`.
 
         Args:
             properties (dict): A dictionary of key-value pairs for properties.
+            bindings (dict, optional): An existing bindings dict to extend, so several
+                                       fragments can share one query. Defaults to a new dict.
 
         Returns:
-            str: A string representation of Gremlin .property() steps.
+            tuple: (fragment, bindings) where fragment is a string of .property() steps
+                   referencing parameter names and bindings maps those names to values.
         """
+        if bindings is None:
+            bindings = {}
         if not properties:
-            return ""
-        props_str = ""
-        for key, value in properties.items():
-            # Ensure key is a string
-            formatted_key = str(key)
-            if isinstance(value, str):
-                # Escape single quotes in string values for Gremlin
-                escaped_value = value.replace("'", "\\'")
-                props_str += f".property('{formatted_key}', '{escaped_value}')"
-            elif isinstance(value, bool):
-                # Gremlin uses 'true'/'false' for booleans
-                props_str += f".property('{formatted_key}', {str(value).lower()})"
-            else:
-                # For numbers, None, etc., directly embed the value
-                props_str += f".property('{formatted_key}', {value})"
-        return props_str
+            return "", bindings
+        keys = tuple(key for key, value in properties.items() if value is not None)
+        shape = (keys, len(bindings))
+        cached = self._shape_cache.get(shape)
+        if cached is None:
+            # Same names _bind would assign: p<n>, p<n+1>, ...
+            names = tuple(f"p{len(bindings) + i}" for i in range(len(keys)))
+            # Keys stay in the query text; values are sent as bindings
+            fragment = "".join(
+                f".property('{self._escape_gremlin_string(str(key))}', {name})" for key, name in zip(keys, names)
+            )
+            if len(self._shape_cache) >= _SHAPE_CACHE_SIZE:
+                self._shape_cache.clear()
+            cached = self._shape_cache[shape] = (fragment, names)
+        fragment, names = cached
+        bindings.update(zip(names, map(properties.__getitem__, keys)))
+        return fragment, bindings
+
+    @property
+    def url(self):
+        """
+        The WebSocket URL of the Gremlin endpoint.
+        """
+        return _URL_TEMPLATE.format(hostname=self.hostname, port=self.port)
+
+    @property
+    def username(self):
+        """
+        The Cosmos DB resource path used as the SASL username.
+        """
+        return _USERNAME_TEMPLATE.format(database=self.database_name, collection=self.collection_name)
+
+    def _connection_options(self):
+        """
+        Returns the constructor arguments shared by the Gremlin client and the
+        remote connection behind 'g', including the shared serializer instance.
+        """
+        return {
+            # The 'enable_ssl' argument is not directly supported by the gremlin-python
+            # client's constructor; the wss:// URL implies it.
+            'url': self.url,
+            'traversal_source': self.traversal_source,
+            # The 'username' parameter in the client is used for SASL authentication.
+            'username': self.username,
+            'password': self.password,
+            'message_serializer': self._serializer,
+            'transport_factory': self.transport_factory,
+        }
 
     def connect(self):
         """
         Establishes a synchronous connection to the Cosmos DB Gremlin endpoint.
+
+        The WebSocket connections are opened once and stay open until close(); all
+        queries of the client reuse them instead of reconnecting per request.
         """
         if self.gremlin_client:
-            print("Already connected.")
+            log.debug("Already connected.")
             return
 
         try:
-            # Construct the connection URL
-            # For Cosmos DB, the URL format is typically wss://<hostname>:<port>/gremlin
-            # Using 'wss://' implicitly enables SSL. The 'enable_ssl' argument is not
-            # directly supported by the gremlin-python client's constructor.
-            connection_url = f"wss://{self.hostname}:{self.port}/gremlin"
-
-            # Cosmos DB expects the username in the format /dbs/<database>/colls/<collection>
-            # The 'username' parameter in the client is used for SASL authentication.
-            cosmos_username = f"/dbs/{self.database_name}/colls/{self.collection_name}"
+            # The serializer is stateless, so the client and the lazy 'g' connection share one
+            self._serializer = self.serializer_cls()
 
             # Initialize the Gremlin client
-            # The client handles the WebSocket connection and sends/receives Gremlin requests.
+            # The client keeps a pool of `pool_size` WebSocket connections and leases one per
+            # request, so concurrent submitAsync calls are spread across sockets.
             self.gremlin_client = client.Client(
-                url=connection_url,
-                traversal_source=self.traversal_source,
-                username=cosmos_username, # Updated username format
-                password=self.password,
-                message_serializer=serializer.GraphSONSerializersV2d0(),
-            )
-            print("Gremlin client initialized.")
-
-            # Create a remote connection and a graph traversal source.
-            # This is necessary for building complex traversals using 'g'.
-            self.connection = DriverRemoteConnection(
-                url=connection_url,
-                traversal_source=self.traversal_source,
-                username=cosmos_username, # Updated username format
-                password=self.password,
-                message_serializer=serializer.GraphSONSerializersV2d0(),
+                **self._connection_options(),
+                pool_size=self.pool_size,
+                max_workers=self.max_workers,
             )
-            self.g = traversal().withRemote(self.connection)
-            print("Successfully connected to Cosmos DB Graph.")
+            # Bound once so per-query calls skip the attribute lookups
+            self._submit = self.gremlin_client.submit
+            self._submit_async = self.gremlin_client.submitAsync
+            log.debug("Successfully connected to Cosmos DB Graph.")
 
         except GremlinServerError as e:
-            print(f"Gremlin Server Error during connection: {e}")
+            log.error("Gremlin Server Error during connection: %s", e)
             self.gremlin_client = None
-            self.connection = None
-            self.g = None
             raise
         except Exception as e:
-            print(f"An unexpected error occurred during connection: {e}")
+            log.error("An unexpected error occurred during connection: %s", e)
             self.gremlin_client = None
-            self.connection = None
-            self.g = None
             raise
 
+    @property
+    def g(self):
+        """
+        The graph traversal source for building fluent traversals.
+
+        All methods of this class submit string queries through gremlin_client, so
+        the DriverRemoteConnection behind 'g' (a second WebSocket pool with its own
+        handshake) is only opened the first time this property is read. Returns
+        None while the client is not connected.
+
+        Note that the Cosmos DB Gremlin API only accepts script (string) requests, not
+        Gremlin bytecode, so fluent traversals submitted through 'g' fail against
+        Cosmos DB. The query-building methods therefore stay string-based, with all
+        values passed as bindings; 'g' is kept for other TinkerPop servers.
+        """
+        if self._g is None and self.gremlin_client:
+            # gremlin_python gives DriverRemoteConnection its own Client, so its sockets
+            # cannot be shared with gremlin_client; only the serializer and settings are
+            self._connection = DriverRemoteConnection(**self._connection_options())
+            self._g = traversal().withRemote(self._connection)
+            log.debug("Remote connection for traversal source 'g' opened.")
+        return self._g
+
     def close(self):
         """
         Closes the connection to the Cosmos DB Gremlin endpoint.
@@ -140,47 +311,61 @@ class CosmosGraphClient:
         if self.gremlin_client:
             try:
                 self.gremlin_client.close()
-                print("Gremlin client closed.")
+                log.debug("Gremlin client closed.")
             except Exception as e:
-                print(f"Error closing Gremlin client: {e}")
+                log.error("Error closing Gremlin client: %s", e)
             self.gremlin_client = None
+            self._submit = None
+            self._submit_async = None
 
-        if self.connection:
+        if self._connection is not None:
+            # Only opened if the g property was used
             try:
-                self.connection.close()
-                print("Remote connection closed.")
+                self._connection.close()
+                log.debug("Remote connection closed.")
             except Exception as e:
-                print(f"Error closing remote connection: {e}")
-            self.connection = None
-        self.g = None
+                log.error("Error closing remote connection: %s", e)
+            self._connection = None
+        self._g = None
 
-    def _execute_query(self, query_string):
+    def __enter__(self):
+        """
+        Connects on entering a with block, so the connection is closed on any exit:
+        with CosmosGraphClient(...) as client: ...
+        """
+        self.connect()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+
+    def _execute_query(self, query_string, bindings=None):
         """
         Executes a raw Gremlin query string synchronously.
 
         Args:
             query_string (str): The Gremlin query string to execute.
+            bindings (dict, optional): Parameter bindings referenced by the query.
 
         Returns:
             list: A list of results from the Gremlin query.
                   Returns an empty list if no results or on error.
         """
         if not self.gremlin_client:
-            print("Error: Not connected to the graph database. Call connect() first.")
+            log.error("Not connected to the graph database. Call connect() first.")
             return []
 
-        print(f"\nExecuting Gremlin query: {query_string}")
+        log.debug("Executing Gremlin query: %s", query_string)
         try:
-            # Submit the query and wait for the result synchronously using .result()
-            result_set = self.gremlin_client.submit(query_string)
-            results = result_set.all().result()
-            print("Query executed successfully.")
+            # Submit the query and wait for the result synchronously, retrying on throttling
+            results = self._submit_with_retry(query_string, bindings)
+            log.debug("Query executed successfully.")
             return results
         except GremlinServerError as e:
-            print(f"Gremlin Server Error during query execution: {e}")
+            log.error("Gremlin Server Error during query execution: %s", e)
             return []
         except Exception as e:
-            print(f"An unexpected error occurred during query execution: {e}")
+            log.error("An unexpected error occurred during query execution: %s", e)
             return []
 
     def create_vertex(self, label, properties=None):
@@ -195,45 +380,168 @@ class CosmosGraphClient:
         Returns:
             list: The result from the Gremlin query (usually the created vertex object).
         """
-        if not self.g:
-            print("Error: Graph traversal source 'g' not initialized. Call connect() first.")
+        if not self.gremlin_client:
+            log.error("Not connected to the graph database. Call connect() first.")
             return []
 
-        # Start building the Gremlin query for adding a vertex
-        query = f"g.addV('{label}')"
+        query, bindings = self._create_vertex_query(label, properties)
+        return self._execute_query(query, bindings)
 
-        # Append properties to the query string
-        query += self._format_properties(properties)
+    def _create_vertex_query(self, label, properties=None):
+        """
+        Builds the addV query and its bindings for create_vertex/a_create_vertex.
+
+        Returns:
+            tuple: (query, bindings)
+        """
+        # Start building the Gremlin query for adding a vertex
+        query = f"g.addV('{self._escape_gremlin_string(label)}')"
 
-        return self._execute_query(query)
+        # Append properties to the query string; their values travel as bindings
+        fragment, bindings = self._format_properties(properties)
+        query += fragment
+        return query, bindings
 
-    def _execute_gremlin_query(self, query: str):
+    def _execute_gremlin_query(self, query: str, bindings: dict = None):
         """
         Executes a Gremlin query against the Cosmos DB graph.
 
         Args:
             query (str): The Gremlin query string.
+            bindings (dict, optional): Parameter bindings referenced by the query.
 
         Returns:
             list: A list of results from the Gremlin query.
             None: If an error occurs during query execution.
         """
         try:
-            # Submit the Gremlin query asynchronously and wait for results
-            callback = self.gremlin_client.submitAsync(query)
-            results = callback.result().all().result()
-            return results
+            # Submit the Gremlin query and wait for results, retrying on throttling
+            return self._submit_with_retry(query, bindings)
         except Exception as e:
-            print(f"Error executing Gremlin query: {query}\nError: {e}")
+            log.error("Error executing Gremlin query: %s\nError: %s", query, e)
             return None
         
+    def _retry_delay(self, error, attempt):
+        """
+        Returns how long to wait before retrying a failed request, or None if the
+        error is not a 429 (request rate too large) or the retries are used up.
+
+        Cosmos DB reports throttling in the status attributes of the Gremlin
+        response ('x-ms-status-code' 429) along with the time to wait
+        ('x-ms-retry-after-ms'). Without that hint the delay backs off
+        exponentially from base_backoff_s. Random jitter is added so throttled
+        requests do not all come back at the same moment.
+        """
+        if attempt >= self.max_retries:
+            return None
+        attributes = getattr(error, 'status_attributes', None) or {}
+        status = attributes.get('x-ms-status-code', getattr(error, 'status_code', None))
+        try:
+            if int(status) != 429:
+                return None
+        except (TypeError, ValueError):
+            return None
+        delay = _parse_retry_after(attributes.get('x-ms-retry-after-ms'))
+        if delay is None:
+            delay = self.base_backoff_s * (2 ** attempt)
+        return delay + random.uniform(0, self.base_backoff_s)
+
+    def _throttle(self, delay, attempt):
+        """
+        Records a 429 so that every request sent through this client, not only the
+        throttled one, holds off for `delay` seconds.
+        """
+        self._throttled_until = max(self._throttled_until, time.monotonic() + delay)
+        log.warning("Request throttled (429); retrying in %.2fs (attempt %d of %d)",
+                    delay, attempt, self.max_retries)
+
+    def _submit_with_retry(self, query, bindings=None):
+        """
+        Submits a query, waits for all of its results and retries it with backoff
+        while Cosmos DB throttles it. Other errors are raised immediately.
+
+        After a 429 the backoff applies client-wide: concurrent requests wait for
+        it too instead of adding to the load that caused the throttling.
+
+        Returns:
+            list: The results of the query.
+        """
+        attempt = 0
+        while True:
+            wait = self._throttled_until - time.monotonic()
+            if wait > 0:
+                time.sleep(wait)
+            try:
+                return self._submit(query, bindings).all().result()
+            except GremlinServerError as e:
+                delay = self._retry_delay(e, attempt)
+                if delay is None:
+                    raise
+                attempt += 1
+                self._throttle(delay, attempt)
+
+    async def _asubmit_with_retry(self, query, bindings=None):
+        """
+        Async twin of _submit_with_retry; waits with asyncio.sleep so other
+        requests keep running during the backoff.
+        """
+        attempt = 0
+        while True:
+            wait = self._throttled_until - time.monotonic()
+            if wait > 0:
+                await asyncio.sleep(wait)
+            try:
+                result_set = await asyncio.wrap_future(self._submit_async(query, bindings))
+                return await asyncio.wrap_future(result_set.all())
+            except GremlinServerError as e:
+                delay = self._retry_delay(e, attempt)
+                if delay is None:
+                    raise
+                attempt += 1
+                self._throttle(delay, attempt)
+
     def _escape_gremlin_string(self, value: str) -> str:
         """
-        Escapes single quotes in a string to be safely used in Gremlin queries.
+        Escapes backslashes and single quotes in a string to be safely used in
+        Gremlin queries, in a single pass over the string.
+
+        Only labels and property keys are embedded in query text; all values are
+        passed as bindings instead.
         """
-        return value.replace("'", "\\'")
+        return value.translate(_ESCAPE_TABLE)
     
-    def _find_vertex(self, label: str, unique_property_name: str, unique_property_value: str):
+    def _pk_clause(self, bindings, partition_key_value) -> str:
+        """
+        Returns the .has(<partition key>, <value>) step scoping a lookup to one
+        partition, or an empty string (a cross-partition lookup) if no value is given.
+        """
+        if partition_key_value is None:
+            return ""
+        return f".has('{self._pk_key}', {self._bind(bindings, partition_key_value)})"
+
+    def _resolve_partition_key_value(self, id_value, properties, partition_key_value):
+        """
+        Returns the partition key value to write for an upserted vertex.
+
+        An explicit partition_key_value wins, then a value for the partition key
+        field in `properties`. Otherwise the vertex id is used, which spreads
+        vertices across partitions. Earlier versions wrote the label instead,
+        putting every vertex of a label on a single partition; callers relying on
+        that must now pass partition_key_value=label explicitly.
+        """
+        if partition_key_value is not None:
+            return partition_key_value
+        if properties and properties.get(self.partition_key_field) is not None:
+            return properties[self.partition_key_field]
+        warnings.warn(
+            "upsert_vertex() called without partition_key_value; the partition key now "
+            "defaults to id_value instead of the vertex label.",
+            FutureWarning,
+            stacklevel=3,
+        )
+        return id_value
+
+    def _find_vertex(self, label: str, unique_property_name: str, unique_property_value: str, partition_key_value=None):
         """
         Checks if a vertex exists based on its label and a unique property.
 
@@ -241,37 +549,106 @@ class CosmosGraphClient:
             label (str): The label of the vertex.
             unique_property_name (str): The name of the property that is unique for this vertex type.
             unique_property_value (str): The value of the unique property.
+            partition_key_value (optional): The vertex's partition key value. When given the
+                                            lookup reads a single partition; otherwise it fans
+                                            out across all partitions.
+
+        Found vertices are kept in an LRU cache, so resolving the same entity again
+        (e.g. while attaching many edges to it) costs a dict lookup instead of a
+        round trip. The partition key value is part of the cache key, so a lookup
+        scoped to one partition never returns a vertex found in another. Upserts
+        through this client evict the affected entries.
 
         Returns:
             dict or None: The found vertex if it exists, otherwise None.
         """
-        escaped_label = self._escape_gremlin_string(label)
-        escaped_prop_name = self._escape_gremlin_string(unique_property_name)
-        escaped_prop_value = self._escape_gremlin_string(unique_property_value)
-
-        # Construct a Gremlin query to find the vertex
-        # We use .has() for both label and the unique property to narrow down the search.
-        # The partition_key_field is crucial for efficient lookup in Cosmos DB.
-        # Assuming unique_property_name is NOT the partition_key_field, we also include the partition key.
-        # If unique_property_name IS the partition_key_field, then the .has() for label is still good.
+        cache_key = (label, unique_property_name, unique_property_value, partition_key_value)
+        cached = self._vertex_cache.get(cache_key)
+        if cached is not None:
+            self._vertex_cache.move_to_end(cache_key)
+            self._cache_hits += 1
+            return cached
+        self._cache_misses += 1
+
+        bindings = {}
         find_query = (
-            f"g.V().hasLabel('{escaped_label}')"
-            f".has('{self.partition_key_field}', '{escaped_label}')" # Always include partition key
-            f".has('{escaped_prop_name}', '{escaped_prop_value}')"
-            f".limit(1)" # We only need to find one
+            "g." + self._find_vertex_step(label, unique_property_name, unique_property_value, partition_key_value, bindings)
+            + ".limit(1)" # We only need to find one
         )
 
-        results = self._execute_gremlin_query(find_query)
+        results = self._execute_gremlin_query(find_query, bindings)
         if results and len(results) > 0:
+            if self._vertex_cache_size > 0:
+                self._vertex_cache[cache_key] = results[0]
+                if len(self._vertex_cache) > self._vertex_cache_size:
+                    self._vertex_cache.popitem(last=False)  # Evict the least recently used entry
             return results[0]  # Return the first found vertex
         return None
 
+    def _find_vertex_step(self, label, unique_property_name, unique_property_value, partition_key_value, bindings):
+        """
+        Builds the step selecting a vertex by label, partition key and unique
+        property, without the leading 'g.'.
+
+        Args:
+            bindings (dict): The bindings dict of the enclosing query; the step's
+                             values are added to it.
+
+        Returns:
+            str: The Gremlin step string.
+        """
+        # We use .has() for both label and the unique property to narrow down the search.
+        # The partition key, when known, is crucial for efficient lookup in Cosmos DB.
+        return (
+            f"V().hasLabel('{self._escape_gremlin_string(label)}')"
+            f"{self._pk_clause(bindings, partition_key_value)}"
+            f".has('{self._escape_gremlin_string(unique_property_name)}', {self._bind(bindings, unique_property_value)})"
+        )
+
+    def find_vertex(self, label: str, unique_property_name: str, unique_property_value: str, partition_key_value=None):
+        """
+        Returns the vertex with the given label and unique property value, or None.
+
+        See _find_vertex; results are served from the LRU cache when possible.
+        """
+        return self._find_vertex(label, unique_property_name, unique_property_value, partition_key_value)
+
+    def _invalidate_vertex(self, label, unique_property_name, unique_property_value, partition_key_value):
+        """
+        Evicts one vertex from the find_vertex cache before it is written: both the
+        entry of its partition and that of a cross-partition lookup.
+        """
+        self._vertex_cache.pop((label, unique_property_name, unique_property_value, partition_key_value), None)
+        self._vertex_cache.pop((label, unique_property_name, unique_property_value, None), None)
+
+    def invalidate_cache(self):
+        """
+        Clears the find_vertex cache, e.g. after the graph was modified by another client.
+        """
+        self._vertex_cache.clear()
 
-    def upsert_vertex(self, label: str, id_value: str, unique_property_name: str, unique_property_value: str, properties: dict):
+    def cache_stats(self):
+        """
+        Returns hit/miss counters and the current size of the find_vertex cache.
+
+        Returns:
+            dict: {'hits', 'misses', 'size', 'maxsize'}
         """
-        Upserts a vertex into the Cosmos DB graph using a two-step process:
-        1. Checks if the vertex exists based on label and a unique property.
-        2. If it exists, updates its properties; otherwise, creates a new vertex.
+        return {
+            'hits': self._cache_hits,
+            'misses': self._cache_misses,
+            'size': len(self._vertex_cache),
+            'maxsize': self._vertex_cache_size,
+        }
+
+
+    def upsert_vertex(self, label: str, id_value: str, unique_property_name: str, unique_property_value: str, properties: dict,
+                      partition_key_value: str = None):
+        """
+        Upserts a vertex into the Cosmos DB graph in a single round trip.
+
+        One traversal looks the vertex up by label and a unique property and, via
+        fold().coalesce(), either updates its properties or creates a new vertex.
 
         Args:
             label (str): The label of the vertex (e.g., "person", "product").
@@ -283,131 +660,683 @@ class CosmosGraphClient:
             properties (dict): A dictionary of additional properties for the vertex.
                                This dictionary should include `unique_property_name` and its value,
                                and can also include other properties. Do NOT include 'id' or 'label' here.
+            partition_key_value (str, optional): The value written to the partition key field and
+                                                 used to scope the lookup. Defaults to the partition
+                                                 key field's entry in `properties`, else to id_value
+                                                 (with a FutureWarning: earlier versions used the label).
 
         Returns:
             dict or None: The upserted vertex (or its ID) if successful, None otherwise.
+                          Always None inside a batch() block, where the write is deferred.
         """
         if not label or not id_value or not unique_property_name or unique_property_value is None:
-            print("Error: label, id_value, unique_property_name, and unique_property_value are required for upserting a vertex.")
+            log.error("label, id_value, unique_property_name, and unique_property_value are required for upserting a vertex.")
             return None
 
+        if self._pending is not None:
+            # Inside a batch() block: defer the write to the bulk flush on exit
+            self._pending['vertices'].append({
+                'label': label,
+                'id_value': id_value,
+                'unique_property_name': unique_property_name,
+                'unique_property_value': unique_property_value,
+                'properties': properties,
+                'partition_key_value': partition_key_value,
+            })
+            return None
+
+        partition_key_value = self._resolve_partition_key_value(id_value, properties, partition_key_value)
+        self._invalidate_vertex(label, unique_property_name, unique_property_value, partition_key_value)
+
+        # Find-and-update or create in one server-side traversal (a single round trip)
+        bindings = {}
+        gremlin_query = "g." + self._upsert_vertex_step(
+            label, id_value, unique_property_name, unique_property_value, properties, bindings,
+            partition_key_value,
+        )
+
+        log.debug("Upserting vertex with ID: %s", id_value)
+        results = self._execute_gremlin_query(gremlin_query, bindings)
+
+        if results and len(results) > 0:
+            return results[0] # Return the upserted vertex object
+        return None
+
+    def create_edge(self, from_vertex_id, to_vertex_id, label, properties=None,
+                    from_partition_key_value=None, to_partition_key_value=None):
+        """
+        Creates a new edge between two existing vertices.
+
+        Both vertices are looked up by id with V(id). When their partition key
+        values are given as well, the lookup is V([pk, id]), a point read in a
+        single partition instead of a fan-out across all partitions.
+
+        Args:
+            from_vertex_id: The ID of the source vertex.
+            to_vertex_id: The ID of the target vertex.
+            label (str): The label for the new edge (e.g., 'knows', 'livesIn').
+            properties (dict, optional): A dictionary of key-value pairs for edge properties.
+                                         Defaults to None.
+            from_partition_key_value (str, optional): Partition key value of the source vertex.
+            to_partition_key_value (str, optional): Partition key value of the target vertex.
+
+        Returns:
+            list: The result from the Gremlin query (usually the created edge object).
+                  Always empty inside a batch() block, where the write is deferred.
+        """
+        if self._pending is not None:
+            # Inside a batch() block: defer the write to the bulk flush on exit
+            self._pending['edges'].append({
+                'from_vertex_id': from_vertex_id,
+                'to_vertex_id': to_vertex_id,
+                'label': label,
+                'properties': properties,
+                'from_partition_key_value': from_partition_key_value,
+                'to_partition_key_value': to_partition_key_value,
+            })
+            return []
+
+        if not self.gremlin_client:
+            log.error("Not connected to the graph database. Call connect() first.")
+            return []
+
+        # Note: Cosmos DB typically requires IDs to be strings.
+        # Gremlin query to add an edge between two vertices by their IDs; the ids and
+        # property values travel as bindings
+        bindings = {}
+        query = "g." + self._create_edge_step(from_vertex_id, to_vertex_id, label, properties, bindings,
+                                              from_partition_key_value, to_partition_key_value)
+
+        return self._execute_query(query, bindings)
+
+    def create_vertex_with_neighbors(self, label, properties, neighbors):
+        """
+        Creates a vertex, upserts its neighbor vertices and links each neighbor to
+        it, all in a single traversal (one round trip).
+
+        Each neighbor spec is a dict with the keyword arguments of upsert_vertex
+        ('label', 'id_value', 'unique_property_name', 'unique_property_value',
+        'properties', optionally 'partition_key_value') plus 'edge_label' and
+        optionally 'edge_properties' for the edge from the neighbor to the new
+        vertex. A spec with 'upsert': False refers to a neighbor known to exist:
+        it is only looked up, not written, and the edge is still created. Not
+        affected by batch(); the write is always sent.
+
+        Args:
+            label (str): The label for the new vertex.
+            properties (dict): A dictionary of key-value pairs for vertex properties.
+            neighbors (iterable): The neighbor specs.
+
+        Returns:
+            list: The result from the Gremlin query (the last created edge).
+        """
+        if not self.gremlin_client:
+            log.error("Not connected to the graph database. Call connect() first.")
+            return []
+
+        query, bindings = self._vertex_with_neighbors_query(label, properties, neighbors)
+        return self._execute_query(query, bindings)
+
+    def _vertex_with_neighbors_query(self, label, properties, neighbors):
+        """
+        Builds the query and bindings for create_vertex_with_neighbors:
+        g.addV(label)<props>.as('v').coalesce(V()..., addV(...)).addE(edge_label).to('v')<edge props>...
+
+        Returns:
+            tuple: (query, bindings)
+        """
+        fragment, bindings = self._format_properties(properties)
+        parts = [f"g.addV('{self._escape_gremlin_string(label)}'){fragment}.as('v')"]
+        for spec in neighbors:
+            if spec.get('upsert', True):
+                partition_key_value = self._resolve_partition_key_value(
+                    spec['id_value'], spec.get('properties'), spec.get('partition_key_value'),
+                )
+                self._invalidate_vertex(
+                    spec['label'], spec['unique_property_name'], spec['unique_property_value'], partition_key_value,
+                )
+                # Path-preserving form: to('v') must still resolve after the upsert
+                vertex_step = self._upsert_vertex_step(
+                    spec['label'], spec['id_value'], spec['unique_property_name'],
+                    spec['unique_property_value'], spec.get('properties'), bindings, partition_key_value,
+                    keep_path=True,
+                )
+            else:
+                # A lookup must not fall back to the id as partition key: without a
+                # known value it runs cross-partition instead of missing the vertex
+                vertex_step = self._find_vertex_step(
+                    spec['label'], spec['unique_property_name'], spec['unique_property_value'],
+                    self._vertex_spec_partition(spec), bindings,
+                )
+            edge_fragment, _ = self._format_properties(spec.get('edge_properties'), bindings)
+            parts.append(
+                f"{vertex_step}.addE('{self._escape_gremlin_string(spec['edge_label'])}').to('v'){edge_fragment}"
+            )
+        return ".".join(parts), bindings
+
+    def _upsert_vertex_step(self, label, id_value, unique_property_name, unique_property_value, properties, bindings,
+                            partition_key_value, keep_path=False):
+        """
+        Builds a single-traversal upsert step for one vertex, without the leading 'g.'.
+
+        The step looks the vertex up by label, partition key and unique property and
+        folds the result, then either updates the existing vertex or adds a new one:
+        V()...fold().coalesce(unfold()<update-props>, addV(label)<create-props>)
+
+        fold() is a barrier that drops the path, so steps labelled earlier with
+        as() cannot be selected after it. With keep_path the lookup runs inside
+        coalesce() instead, which keeps the path:
+        coalesce(V()...<update-props>, addV(label)<create-props>)
+
+        Args:
+            bindings (dict): The bindings dict of the enclosing query; the step's
+                             values are added to it.
+            partition_key_value: The resolved partition key value of the vertex.
+            keep_path (bool): Whether to use the path-preserving form (default is False).
+
+        Returns:
+            str: The Gremlin step string.
+        """
+        escaped_label = self._escape_gremlin_string(label)
         # Create a mutable copy of properties to avoid modifying the original dictionary
         # and ensure 'id' and 'label' are not included in generic properties
-        filtered_properties = {k: v for k, v in properties.items() if k not in ['id', 'label']}
+        filtered_properties = {k: v for k, v in (properties or {}).items() if k not in ['id', 'label']}
 
         # Ensure the unique property is also in the filtered_properties dictionary for creation/update
         # This is important if unique_property_name was not originally in the properties dict
         if unique_property_name not in filtered_properties:
             filtered_properties[unique_property_name] = unique_property_value
 
+        # The unique property and partition key are not updated on an existing vertex
+        update_properties = {
+            k: v for k, v in filtered_properties.items()
+            if k not in (unique_property_name, self.partition_key_field, 'id')
+        }
+        create_properties = {
+            k: v for k, v in filtered_properties.items()
+            if k not in (self.partition_key_field, 'id')
+        }
+
+        find_step = self._find_vertex_step(
+            label, unique_property_name, unique_property_value, partition_key_value, bindings
+        )
+        update_fragment, _ = self._format_properties(update_properties, bindings)
+        id_param = self._bind(bindings, id_value)
+        pk_param = self._bind(bindings, partition_key_value)
+        create_fragment, _ = self._format_properties(create_properties, bindings)
+
+        create_step = (
+            f"addV('{escaped_label}')"
+            f".property('id', {id_param})"
+            f".property('{self._pk_key}', {pk_param})"
+            f"{create_fragment}"
+        )
+        if keep_path:
+            return f"coalesce({find_step}{update_fragment}, {create_step})"
+        return f"{find_step}.fold().coalesce(unfold(){update_fragment}, {create_step})"
+
+    def _vertex_ref(self, bindings, id_value, partition_key_value):
+        """
+        Returns the V() argument addressing a vertex: its bound id, or the bound
+        [partition key, id] pair when the partition key value is known.
+        """
+        id_param = self._bind(bindings, id_value)
+        if partition_key_value is None:
+            return id_param
+        return f"[{self._bind(bindings, partition_key_value)}, {id_param}]"
 
-        # Step 1: Check if the vertex exists
-        existing_vertex = self._find_vertex(label, unique_property_name, unique_property_value)
+    def _create_edge_step(self, from_vertex_id, to_vertex_id, label, properties, bindings,
+                          from_partition_key_value=None, to_partition_key_value=None):
+        """
+        Builds an edge creation step for one edge, without the leading 'g.'.
 
-        gremlin_query = ""
-        if existing_vertex:
-            # Step 2a: Vertex exists, update its properties
-            vertex_id = existing_vertex.get('id')
-            if not vertex_id:
-                print(f"Error: Found vertex has no 'id' property. Cannot update. Vertex: {existing_vertex}")
-                return None
+        Args:
+            bindings (dict): The bindings dict of the enclosing query; the step's
+                             values are added to it.
+
+        Returns:
+            str: The Gremlin step string.
+        """
+        from_param = self._vertex_ref(bindings, from_vertex_id, from_partition_key_value)
+        to_param = self._vertex_ref(bindings, to_vertex_id, to_partition_key_value)
+        fragment, _ = self._format_properties(properties, bindings)
+        return (
+            f"V({from_param})"
+            f".addE('{self._escape_gremlin_string(label)}')"
+            f".to(g.V({to_param}))"
+            f"{fragment}"
+        )
+
+    @staticmethod
+    def _by_partition(specs, partition_key_of):
+        """
+        Returns the specs stably sorted by partition key value, so each chunk of a
+        bulk call touches as few partitions as possible. Specs without a known
+        partition key value go last, in their original order.
+        """
+        def sort_key(spec):
+            value = partition_key_of(spec)
+            return (value is None, str(value))
+        return sorted(specs, key=sort_key)
+
+    def _vertex_spec_partition(self, spec):
+        """
+        Returns the partition key value an upsert spec names, without the id fallback.
+        """
+        if spec.get('partition_key_value') is not None:
+            return spec['partition_key_value']
+        return (spec.get('properties') or {}).get(self.partition_key_field)
+
+    @staticmethod
+    def _edge_spec_partition(spec):
+        """
+        Returns the partition key value of an edge spec: an edge is stored with its source vertex.
+        """
+        return spec.get('from_partition_key_value')
+
+    @staticmethod
+    def _chunked(items, size):
+        """
+        Yields successive lists of at most `size` items from `items`.
+        """
+        chunk = []
+        for item in items:
+            chunk.append(item)
+            if len(chunk) == size:
+                yield chunk
+                chunk = []
+        if chunk:
+            yield chunk
+
+    def _bulk_upsert_query(self, specs):
+        """
+        Builds one traversal upserting every vertex spec in `specs` and evicts those
+        vertices from the find_vertex cache.
+
+        Returns:
+            tuple: (query, bindings)
+        """
+        partition_key_values = [
+            self._resolve_partition_key_value(spec['id_value'], spec.get('properties'), spec.get('partition_key_value'))
+            for spec in specs
+        ]
+        for spec, partition_key_value in zip(specs, partition_key_values):
+            self._invalidate_vertex(
+                spec['label'], spec['unique_property_name'], spec['unique_property_value'], partition_key_value,
+            )
+
+        bindings = {}
+        query = "g." + ".".join(
+            self._upsert_vertex_step(
+                spec['label'], spec['id_value'], spec['unique_property_name'],
+                spec['unique_property_value'], spec.get('properties'), bindings, partition_key_value,
+            )
+            for spec, partition_key_value in zip(specs, partition_key_values)
+        )
+        return query, bindings
+
+    def _bulk_edge_query(self, specs):
+        """
+        Builds one traversal creating every edge spec in `specs`.
+
+        Returns:
+            tuple: (query, bindings)
+        """
+        bindings = {}
+        query = "g." + ".".join(
+            self._create_edge_step(
+                spec['from_vertex_id'], spec['to_vertex_id'], spec['label'], spec.get('properties'), bindings,
+                spec.get('from_partition_key_value'), spec.get('to_partition_key_value'),
+            )
+            for spec in specs
+        )
+        return query, bindings
+
+    def bulk_upsert_vertices(self, specs, batch_size=80):
+        """
+        Upserts many vertices, chaining `batch_size` upserts into each traversal.
+
+        Each spec is a dict with the keyword arguments of upsert_vertex
+        ('label', 'id_value', 'unique_property_name', 'unique_property_value',
+        'properties' and optionally 'partition_key_value'). Every chunk of specs is sent as one request of the form
+        g.V()...fold().coalesce(...).V()...fold().coalesce(...)..., so the network
+        round trip and per-request server overhead are paid once per chunk
+        rather than once per vertex. Specs are grouped by partition key value
+        first, so a chunk is routed to as few partitions as possible.
+
+        Args:
+            specs (iterable): The vertex specs to upsert.
+            batch_size (int): Number of vertices per traversal (50-100 is a good range).
+
+        Returns:
+            list: The results of all submitted traversals.
+        """
+        if not self.gremlin_client:
+            log.error("Not connected to the graph database. Call connect() first.")
+            return []
+
+        results = []
+        for chunk in self._chunked(self._by_partition(specs, self._vertex_spec_partition), batch_size):
+            query, bindings = self._bulk_upsert_query(chunk)
+            log.debug("Upserting %d vertices in one traversal", len(chunk))
+            chunk_results = self._execute_gremlin_query(query, bindings)
+            if chunk_results:
+                results.extend(chunk_results)
+        return results
+
+    def bulk_create_edges(self, specs, batch_size=80):
+        """
+        Creates many edges, chaining `batch_size` addE steps into each traversal.
+
+        Each spec is a dict with the keyword arguments of create_edge
+        ('from_vertex_id', 'to_vertex_id', 'label', 'properties' and optionally
+        'from_partition_key_value' and 'to_partition_key_value'). Specs are
+        grouped by the partition key value of their source vertex first, where
+        each edge is stored.
+
+        Args:
+            specs (iterable): The edge specs to create.
+            batch_size (int): Number of edges per traversal (50-100 is a good range).
+
+        Returns:
+            list: The results of all submitted traversals.
+        """
+        if not self.gremlin_client:
+            log.error("Not connected to the graph database. Call connect() first.")
+            return []
+
+        results = []
+        for chunk in self._chunked(self._by_partition(specs, self._edge_spec_partition), batch_size):
+            query, bindings = self._bulk_edge_query(chunk)
+            log.debug("Creating %d edges in one traversal", len(chunk))
+            chunk_results = self._execute_gremlin_query(query, bindings)
+            if chunk_results:
+                results.extend(chunk_results)
+        return results
+
+    def _df_upsert_template(self, label, columns, n):
+        """
+        Returns the query text upserting `n` rows together with the binding names
+        of each row, built once per (label, columns, n) and then reused.
 
-            escaped_vertex_id = self._escape_gremlin_string(vertex_id)
-            escaped_label = self._escape_gremlin_string(label)
+        `columns` is (id, unique property, partition key, *properties). Row i's value
+        for columns[j] is bound as r{i}c{j}, so every chunk of the same shape sends
+        identical query text and only the bindings change.
 
-            # Start the update query by selecting the existing vertex
-            gremlin_query = (
-                f"g.V('{escaped_vertex_id}')"
-                f".has('{self.partition_key_field}', '{escaped_label}')" # Ensure partition key is used for update
+        Returns:
+            tuple: (query, names) where names[i] lists row i's binding names in column order.
+        """
+        key = (label, columns, n)
+        cached = self._df_template_cache.get(key)
+        if cached is not None:
+            return cached
+
+        escaped_label = self._escape_gremlin_string(label)
+        escaped_unique = self._escape_gremlin_string(str(columns[1]))
+        # As in _upsert_vertex_step, the unique property is only written on creation
+        create_unique = columns[1] not in (self.partition_key_field, 'id', 'label')
+
+        steps = []
+        names = []
+        for i in range(n):
+            row_names = tuple(f"r{i}c{j}" for j in range(len(columns)))
+            names.append(row_names)
+            update_fragment = "".join(
+                f".property('{self._escape_gremlin_string(str(columns[j]))}', {row_names[j]})"
+                for j in range(3, len(columns))
+            )
+            steps.append(
+                f"V().hasLabel('{escaped_label}')"
+                f".has('{self._pk_key}', {row_names[2]})"
+                f".has('{escaped_unique}', {row_names[1]})"
+                f".fold().coalesce("
+                f"unfold(){update_fragment}, "
+                f"addV('{escaped_label}')"
+                f".property('id', {row_names[0]})"
+                f".property('{self._pk_key}', {row_names[2]})"
+                + (f".property('{escaped_unique}', {row_names[1]})" if create_unique else "")
+                + f"{update_fragment})"
             )
+        cached = ("g." + ".".join(steps), names)
+        self._df_template_cache[key] = cached
+        return cached
+
+    def _collect_in_flight(self, future, query, bindings):
+        """
+        Waits for a query submitted with _submit_async and returns its results. A
+        throttled query starts the client-wide backoff and is then resent through
+        the retrying synchronous path, which waits it out.
+        """
+        try:
+            return future.result().all().result()
+        except GremlinServerError as e:
+            delay = self._retry_delay(e, 0)
+            if delay is None:
+                log.error("Gremlin Server Error during query execution: %s", e)
+                return []
+            self._throttle(delay, 1)
+            return self._execute_gremlin_query(query, bindings) or []
+        except Exception as e:
+            log.error("Error executing Gremlin query: %s\nError: %s", query, e)
+            return []
+
+    def upsert_vertices_df(self, df, label, id_col, unique_col, property_cols=(), partition_key_col=None,
+                           batch_size=80, max_in_flight=4):
+        """
+        Upserts one vertex per row of a DataFrame (or an iterable of dicts) with
+        the same fold().coalesce() logic as upsert_vertex.
 
-            # Add property updates from the filtered_properties
-            for key, value in filtered_properties.items():
-                if key == unique_property_name or key == self.partition_key_field or key == 'id':
-                    # Skip the unique property and partition key, as they are not updated
-                    continue
-                escaped_key = self._escape_gremlin_string(key)
-                if isinstance(value, str):
-                    escaped_value = self._escape_gremlin_string(value)
-                    gremlin_query += f".property('{escaped_key}', '{escaped_value}')"
-                else:
-                    gremlin_query += f".property('{escaped_key}', {value})" # For non-string values
+        Rows are sent in chunks of `batch_size` upserts per traversal. The query
+        text for a chunk depends only on the label, the columns and the chunk
+        length, so it is built once and reused for every chunk; per row only the
+        binding values are filled in. Up to `max_in_flight` chunks are submitted
+        before the oldest one is waited on, which keeps the connection pool busy
+        without queueing the whole frame in the driver. Like every other request,
+        a chunk is not submitted while the client-wide 429 backoff is running.
 
-            print(f"Updating existing vertex with ID: {vertex_id}")
+        Every row binds every column, so the selected columns must not contain
+        None/NaN values; fill or drop them beforehand.
 
+        Args:
+            df: A pandas DataFrame (read with itertuples) or an iterable of dicts.
+            label (str): The label of every vertex.
+            id_col (str): Column holding the vertex id.
+            unique_col (str): Column holding the unique property used for the lookup.
+            property_cols (iterable): Columns written as vertex properties.
+            partition_key_col (str, optional): Column holding the partition key value. Defaults
+                                               to the partition key field if it is one of
+                                               `property_cols`, else to `id_col`.
+            batch_size (int): Number of vertices per traversal (50-100 is a good range).
+            max_in_flight (int): Maximum number of traversals awaiting a response.
+
+        Returns:
+            list: The results of all submitted traversals.
+        """
+        if not self.gremlin_client:
+            log.error("Not connected to the graph database. Call connect() first.")
+            return []
+
+        property_cols = tuple(property_cols)
+        if partition_key_col is None:
+            partition_key_col = self.partition_key_field if self.partition_key_field in property_cols else id_col
+        # The id, unique property and partition key are bound from their own columns
+        property_cols = tuple(
+            c for c in property_cols
+            if c not in (unique_col, partition_key_col, self.partition_key_field, 'id', 'label')
+        )
+        columns = (id_col, unique_col, partition_key_col, *property_cols)
+
+        if hasattr(df, 'itertuples'):
+            positions = {name: i for i, name in enumerate(df.columns)}
+            rows = map(operator.itemgetter(*(positions[c] for c in columns)), df.itertuples(index=False, name=None))
         else:
-            # Step 2b: Vertex does not exist, create a new one
-            escaped_label = self._escape_gremlin_string(label)
-            escaped_id_value = self._escape_gremlin_string(id_value)
-
-            # Start the creation query
-            gremlin_query = f"g.addV('{escaped_label}')" \
-                            f".property('id', '{escaped_id_value}')" \
-                            f".property('{self.partition_key_field}', '{escaped_label}')" # Set partition key
-
-            # Add all properties from the filtered_properties
-            # for key, value in filtered_properties.items():
-            for key, value in filtered_properties.items():
-                if key == self.partition_key_field or key == 'id':
-                    continue
-                escaped_key = self._escape_gremlin_string(key)
-                if isinstance(value, str):
-                    escaped_value = self._escape_gremlin_string(value)
-                    gremlin_query += f".property('{escaped_key}', '{escaped_value}')"
-                else:
-                    gremlin_query += f".property('{escaped_key}', {value})"
-
-            print(f"Creating new vertex with ID: {id_value}")
-
-        results = self._execute_gremlin_query(gremlin_query)
+            rows = map(operator.itemgetter(*columns), df)
+
+        results = []
+        in_flight = deque()
+        for chunk in self._chunked(rows, batch_size):
+            query, names = self._df_upsert_template(label, columns, len(chunk))
+            bindings = {}
+            for row_names, row in zip(names, chunk):
+                self._invalidate_vertex(label, unique_col, row[1], row[2])
+                bindings.update(zip(row_names, row))
+
+            if len(in_flight) >= max_in_flight:
+                results.extend(self._collect_in_flight(*in_flight.popleft()))
+            wait = self._throttled_until - time.monotonic()
+            if wait > 0:
+                time.sleep(wait)  # A request was throttled: hold new chunks back too
+            log.debug("Upserting %d vertices in one traversal", len(chunk))
+            in_flight.append((self._submit_async(query, bindings), query, bindings))
+
+        while in_flight:
+            results.extend(self._collect_in_flight(*in_flight.popleft()))
+        return results
+
+    @contextmanager
+    def batch(self, batch_size=80):
+        """
+        Context manager that buffers upsert_vertex/create_edge calls and writes them
+        in bulk when the block exits.
 
-        if results and len(results) > 0:
-            return results[0] # Return the upserted vertex object
-        return None
+        Vertices are flushed before edges so edges can reference vertices upserted in
+        the same block. Calls made inside the block return None / [] since nothing is
+        written until the flush.
 
-    def create_edge(self, from_vertex_id, to_vertex_id, label, properties=None):
+        Args:
+            batch_size (int): Number of objects per traversal used for the flush.
         """
-        Creates a new edge between two existing vertices.
+        if self._pending is not None:
+            # Already batching: the outermost block flushes
+            yield self
+            return
+
+        self._pending = {'vertices': [], 'edges': []}
+        try:
+            yield self
+            pending = self._pending
+        finally:
+            self._pending = None
+        self.bulk_upsert_vertices(pending['vertices'], batch_size=batch_size)
+        self.bulk_create_edges(pending['edges'], batch_size=batch_size)
+
+    # --- Async API ---
+    # Twins of the synchronous methods that await the driver's futures instead of
+    # blocking on .result(), so many requests can be in flight on the connection
+    # pool at once (e.g. with asyncio.gather).
+
+    async def aexecute(self, query, bindings=None):
+        """
+        Executes a Gremlin query without blocking the event loop.
 
         Args:
-            from_vertex_id: The ID of the source vertex.
-            to_vertex_id: The ID of the target vertex.
-            label (str): The label for the new edge (e.g., 'knows', 'livesIn').
-            properties (dict, optional): A dictionary of key-value pairs for edge properties.
-                                         Defaults to None.
+            query (str): The Gremlin query string to execute.
+            bindings (dict, optional): Parameter bindings referenced by the query.
 
         Returns:
-            list: The result from the Gremlin query (usually the created edge object).
+            list: A list of results from the Gremlin query.
+                  Returns an empty list if no results or on error.
         """
-        if not self.g:
-            print("Error: Graph traversal source 'g' not initialized. Call connect() first.")
+        if not self.gremlin_client:
+            log.error("Not connected to the graph database. Call connect() first.")
             return []
 
-        # Gremlin query to add an edge between two vertices by their IDs
-        # Note: Cosmos DB typically requires IDs to be strings.
-        query = (
-            f"g.V('{from_vertex_id}')"
-            f".addE('{label}')"
-            f".to(g.V('{to_vertex_id}'))"
+        try:
+            return await self._asubmit_with_retry(query, bindings)
+        except GremlinServerError as e:
+            log.error("Gremlin Server Error during query execution: %s", e)
+            return []
+        except Exception as e:
+            log.error("An unexpected error occurred during query execution: %s", e)
+            return []
+
+    async def a_run_query(self, query, bindings=None):
+        """
+        Async twin of run_query.
+        """
+        return await self.aexecute(query, bindings)
+
+    async def a_create_vertex(self, label, properties=None):
+        """
+        Async twin of create_vertex.
+        """
+        query, bindings = self._create_vertex_query(label, properties)
+        return await self.aexecute(query, bindings)
+
+    async def a_upsert_vertex(self, label: str, id_value: str, unique_property_name: str, unique_property_value: str, properties: dict,
+                              partition_key_value: str = None):
+        """
+        Async twin of upsert_vertex. Not affected by batch(); the write is always sent.
+
+        Returns:
+            dict or None: The upserted vertex if successful, None otherwise.
+        """
+        if not label or not id_value or not unique_property_name or unique_property_value is None:
+            log.error("label, id_value, unique_property_name, and unique_property_value are required for upserting a vertex.")
+            return None
+
+        partition_key_value = self._resolve_partition_key_value(id_value, properties, partition_key_value)
+        self._invalidate_vertex(label, unique_property_name, unique_property_value, partition_key_value)
+        bindings = {}
+        query = "g." + self._upsert_vertex_step(
+            label, id_value, unique_property_name, unique_property_value, properties, bindings,
+            partition_key_value,
         )
+        results = await self.aexecute(query, bindings)
+        return results[0] if results else None
 
-        # Append properties to the query string
-        query += self._format_properties(properties)
+    async def a_create_edge(self, from_vertex_id, to_vertex_id, label, properties=None,
+                            from_partition_key_value=None, to_partition_key_value=None):
+        """
+        Async twin of create_edge. Not affected by batch(); the write is always sent.
+        """
+        bindings = {}
+        query = "g." + self._create_edge_step(from_vertex_id, to_vertex_id, label, properties, bindings,
+                                              from_partition_key_value, to_partition_key_value)
+        return await self.aexecute(query, bindings)
 
-        return self._execute_query(query)
+    async def a_create_vertex_with_neighbors(self, label, properties, neighbors):
+        """
+        Async twin of create_vertex_with_neighbors.
+        """
+        query, bindings = self._vertex_with_neighbors_query(label, properties, neighbors)
+        return await self.aexecute(query, bindings)
 
-    def run_query(self, query):
+    async def abulk_upsert_vertices(self, specs, batch_size=80):
+        """
+        Async twin of bulk_upsert_vertices; all chunks are submitted concurrently.
+        """
+        queries = [
+            self._bulk_upsert_query(chunk)
+            for chunk in self._chunked(self._by_partition(specs, self._vertex_spec_partition), batch_size)
+        ]
+        chunk_results = await asyncio.gather(*(self.aexecute(q, b) for q, b in queries))
+        return [result for results in chunk_results for result in results]
+
+    async def abulk_create_edges(self, specs, batch_size=80):
+        """
+        Async twin of bulk_create_edges; all chunks are submitted concurrently.
+        """
+        queries = [
+            self._bulk_edge_query(chunk)
+            for chunk in self._chunked(self._by_partition(specs, self._edge_spec_partition), batch_size)
+        ]
+        chunk_results = await asyncio.gather(*(self.aexecute(q, b) for q, b in queries))
+        return [result for results in chunk_results for result in results]
+
+    def run_query(self, query, bindings=None):
         """
         Executes an arbitrary Gremlin query string.
 
         Args:
             query (str): The full Gremlin query string to execute.
+            bindings (dict, optional): Parameter bindings referenced by the query.
 
         Returns:
             list: A list of results from the Gremlin query.
                   Returns an empty list if no results or on error.
         """
-        return self._execute_query(query)
+        return self._execute_query(query, bindings)
 
 # Example Usage (replace with your actual Cosmos DB credentials and endpoint)
 # if __name__ == "__main__":
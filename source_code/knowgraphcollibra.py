@@ -1,18 +1,408 @@
+import argparse
+import asyncio
+import itertools
+import threading
+from collibra_client import get_session
+from cosmosgraphbulk import CosmosGraphBulkWriter, document_endpoint
 from cosmosgremlinclient import CosmosGraphClient
-from collibrarestassets import get_all_collibra_assets_basic_auth
-from collibrarestrelations import get_all_collibra_relations
+from collibrarestassets import iter_collibra_assets
+from collibrarestrelations import iter_collibra_relations
 import logging
 from azure.cosmos import exceptions # Re-added this import for specific error handling
 from dotenv import load_dotenv
 import os
 
-load_dotenv()  # Load environment variables from .env file
-# Configure logging for gremlinpython to see connection details and query execution
-logging.basicConfig(level=logging.INFO)
 log = logging.getLogger(__name__)
 
+# Maximum number of Gremlin requests in flight during ingestion; tune against the provisioned RU/s
+INGEST_CONCURRENCY = 32
+# Fetched assets or relation batches buffered ahead of the ingestion
+INGEST_QUEUE_SIZE = 1000
+# Relation edges created per traversal
+RELATION_BATCH_SIZE = 50
+# Vertices dropped per request by --clean; larger batches risk exceeding the request limits
+DROP_LIMIT = 500
+DROP_QUERY = "g.V().limit(lim).sideEffect(drop()).count()"
+# Consecutive drop requests that may fail before --clean gives up
+DROP_MAX_STALLS = 3
+
+# Keys copied into vertex properties. Tuples keep the property order (and so the
+# query text) stable; the frozensets give hashed membership tests.
+ASSET_KEYS = ('id', 'createdBy', 'createdOn', 'lastModifiedBy', 'lastModifiedOn', 'system', 'resourceType', 'name', 'displayName', 'articulationScore', 'excludedFromAutoHyperlinking', 'avgRating', 'ratingsCount')
+DOMAIN_KEYS = ('id', 'resourceType', 'resourceDiscriminator', 'name')
+TYPE_KEYS = ('id', 'resourceType', 'resourceDiscriminator', 'name')
+STATUS_KEYS = ('id', 'resourceType', 'resourceDiscriminator', 'name')
+ASSET_KEYS_SET = frozenset(ASSET_KEYS)
+DOMAIN_KEYS_SET = frozenset(DOMAIN_KEYS)
+TYPE_KEYS_SET = frozenset(TYPE_KEYS)
+STATUS_KEYS_SET = frozenset(STATUS_KEYS)
+# (asset key, keys to extract, their set, default vertex label, edge label) of each vertex linked to an asset
+ASSET_REFERENCES = (
+    ('domain', DOMAIN_KEYS, DOMAIN_KEYS_SET, 'Domain', 'belongsTo_domain'),
+    ('type', TYPE_KEYS, TYPE_KEYS_SET, 'Type', 'belongsTo_type'),
+    ('status', STATUS_KEYS, STATUS_KEYS_SET, 'Status', 'belongsTo_status'),
+)
+
+
+try:
+    from itertools import batched
+except ImportError: # Python < 3.12
+    def batched(iterable, n):
+        """
+        Yields successive tuples of at most `n` items, like itertools.batched.
+        """
+        iterator = iter(iterable)
+        while chunk := tuple(itertools.islice(iterator, n)):
+            yield chunk
+
+
+def build_reference_spec(asset, reference, keys, keys_set, default_label, edge_label, edge_properties):
+    """
+    Builds the neighbor spec (see CosmosGraphClient.create_vertex_with_neighbors)
+    that upserts an asset's domain, type or status vertex and links it to the asset.
+
+    `edge_properties` is shared by all references of an asset and is only read.
+    """
+    source = asset[reference]
+    reference_data = {key: source[key] for key in keys if key in source}
+    if log.isEnabledFor(logging.DEBUG) and len(reference_data) < len(keys):
+        log.debug("Keys %s not found in the %s dictionary. Skipping.", sorted(keys_set - source.keys()), reference)
+    log.debug("%s Data: %s", reference.capitalize(), reference_data)
+    return {
+        'label': reference_data.get('resourceType', default_label),
+        'id_value': reference_data.get('id'),
+        'unique_property_name': 'id',
+        'unique_property_value': reference_data.get('id'),
+        'properties': reference_data,
+        'partition_key_value': reference_data.get('resourceType', default_label),
+        'edge_label': edge_label,
+        'edge_properties': edge_properties,
+    }
+
+
+def extract_asset_data(asset):
+    """
+    Returns the ASSET_KEYS present in a Collibra asset, i.e. its vertex properties.
+    """
+    asset_data = {key: asset[key] for key in ASSET_KEYS if key in asset}
+    if log.isEnabledFor(logging.DEBUG) and len(asset_data) < len(ASSET_KEYS):
+        log.debug("Keys %s not found in the original dictionary. Skipping.", sorted(ASSET_KEYS_SET - asset.keys()))
+    log.debug("Asset Data: %s", asset_data)
+    return asset_data
+
+
+def drop_all_vertices(client, drop_limit=DROP_LIMIT, max_stalls=DROP_MAX_STALLS):
+    """
+    Drops every vertex (and with it every edge) in batches of `drop_limit`.
+
+    Each request drops a batch and returns how many vertices it dropped, so no
+    separate count query (a full scan) is needed; the loop ends on a short batch.
+    The batch size is bound rather than interpolated, so every request sends the
+    same query text and Cosmos can reuse its parsed plan.
+
+    A failed request returns no result at all (rather than a count of 0) and is
+    retried, but after `max_stalls` failures in a row without progress the loop
+    gives up with an error instead of spinning on a partition that cannot be
+    drained.
+
+    Returns:
+        bool: True if the graph was emptied, False if the loop stalled.
+    """
+    print(f"Dropping vertices in batches of {drop_limit}...")
+    total = 0
+    stalls = 0
+    while True:
+        results = client.run_query(DROP_QUERY, {'lim': drop_limit})
+        if not results:
+            stalls += 1
+            if stalls >= max_stalls:
+                log.error("Dropping vertices stalled after %d vertices: %d requests in a row failed", total, stalls)
+                return False
+            continue
+        stalls = 0
+        dropped = results[0]
+        if dropped == 0:
+            break
+        total += dropped
+        print(f"Dropped {total} vertices so far...")
+        if dropped < drop_limit:
+            break  # A partial batch means the graph is now empty
+    print(f"Dropped {total} vertices.")
+    return True
+
+
+async def ingest_asset(client, asset, semaphore, written, ingested=None):
+    """
+    Creates the vertex of one Collibra asset and upserts and links its domain, type
+    and status vertices, all in a single traversal.
+
+    Assets share a small set of domains, types and statuses, so each of those is
+    upserted only once per run. `written` maps (label, id) to a future resolved by
+    the asset whose traversal upserts that vertex (True once it is in the graph).
+    An asset that writes none of its references waits for those futures and then
+    only looks the vertices up to attach its edges. An asset that writes at least
+    one never waits, so two assets cannot wait on each other; it upserts all of
+    its references instead. The asset's id is added to `ingested` (if given)
+    once its vertex is written.
+    """
+    asset_data = extract_asset_data(asset)
+    edge_properties = {'since': asset.get('createdOn', 'unknown')}
+
+    neighbors = [
+        build_reference_spec(asset, reference, keys, keys_set, default_label, edge_label, edge_properties)
+        for reference, keys, keys_set, default_label, edge_label in ASSET_REFERENCES
+        if reference in asset
+    ]
+
+    owned = []
+    pending = []
+    for spec in neighbors:
+        key = (spec['label'], spec['id_value'])
+        future = written.get(key)
+        if future is None:
+            future = written[key] = asyncio.get_running_loop().create_future()
+            owned.append((key, future))
+        else:
+            pending.append((spec, future))
+
+    asset_vertex = None
+    try:
+        if not owned:
+            for spec, future in pending:
+                if await future:
+                    spec['upsert'] = False # Already in the graph: only attach the edge
+
+        async with semaphore:
+            asset_vertex = await client.a_create_vertex_with_neighbors(
+                label=asset_data.get('resourceType', 'Asset'),  # Use resourceType as label, default to 'Asset'
+                properties=asset_data,
+                neighbors=neighbors,
+            )
+        if not asset_vertex and neighbors and not owned:
+            # A lookup that misses ends the traversal after addV: the asset may exist without its edges
+            log.warning("Linking Collibra Asset %s to its %d existing vertices returned nothing; "
+                        "its edges may be missing", asset['id'], len(neighbors))
+        if asset_vertex and ingested is not None:
+            ingested.add(asset['id'])
+        log.debug("Created Collibra Asset Vertex %s with %d linked vertices: %s", asset['id'], len(neighbors), asset_vertex)
+    finally:
+        for key, future in owned:
+            if not asset_vertex:
+                written.pop(key, None) # Not written: let a later asset try again
+            future.set_result(bool(asset_vertex))
+
+
+def produce(items, queue, loop, stop):
+    """
+    Puts the items of a blocking iterable on an asyncio queue, from a worker thread.
+
+    Blocks while the queue is full, so the source is never read more than the
+    queue size ahead of the consumers. Stops early once `stop` is set.
+    """
+    for item in items:
+        if stop.is_set():
+            return
+        asyncio.run_coroutine_threadsafe(queue.put(item), loop).result()
+
+
+async def consume(queue, handle):
+    """
+    Awaits handle(item) for each queued item until the None sentinel arrives.
+    """
+    while (item := await queue.get()) is not None:
+        await handle(item)
+
+
+async def pipeline(items, handle, consumers, maxsize=INGEST_QUEUE_SIZE):
+    """
+    Feeds the items of a blocking iterable to `consumers` tasks that await handle(item).
+
+    The iterable (e.g. a paged Collibra fetch) is read by a producer on a worker
+    thread and handed over through an asyncio.Queue of `maxsize` items, so fetching
+    the next pages overlaps with ingesting the current ones instead of blocking
+    the event loop. A None sentinel per consumer marks the end of the items.
+
+    Returns:
+        int: The number of items handled.
+    """
+    loop = asyncio.get_running_loop()
+    queue = asyncio.Queue(maxsize)
+    stop = threading.Event()
+    count = 0
+
+    async def handle_counted(item):
+        nonlocal count
+        await handle(item)
+        count += 1
+
+    workers = [asyncio.create_task(consume(queue, handle_counted)) for _ in range(consumers)]
+    producer = asyncio.create_task(asyncio.to_thread(produce, items, queue, loop, stop))
+    try:
+        # Consumers only finish early by failing, which must not leave the producer blocked
+        done, _ = await asyncio.wait([producer, *workers], return_when=asyncio.FIRST_COMPLETED)
+        for task in done:
+            task.result()  # Re-raise failures
+        await producer
+        for _ in workers:
+            await queue.put(None)
+        await asyncio.gather(*workers)
+    except BaseException:
+        # Unblock and stop the producer, then drop the consumers
+        stop.set()
+        while not queue.empty():
+            queue.get_nowait()
+        for worker in workers:
+            worker.cancel()
+        raise
+    return count
+
+
+async def ingest_assets(client, assets, concurrency=INGEST_CONCURRENCY, ingested=None):
+    """
+    Ingests assets from any iterable concurrently, with at most `concurrency`
+    requests in flight. The ids of the assets written are added to `ingested`
+    (if given), for ingest_relations.
+
+    Assets are fetched on a worker thread while earlier ones are being ingested
+    (see pipeline()), so a streaming source such as iter_collibra_assets() keeps
+    a bounded number in memory.
+
+    Returns:
+        int: The number of assets ingested.
+    """
+    semaphore = asyncio.Semaphore(concurrency)
+    written = {}
+
+    async def handle(asset):
+        await ingest_asset(client, asset, semaphore, written, ingested)
+
+    # Twice the request limit, so assets waiting on a shared reference do not idle the connections
+    return await pipeline(assets, handle, 2 * concurrency)
+
+
+async def ingest_relation_batch(client, specs, semaphore):
+    """
+    Creates the 'relatedTo' edges of a batch of Collibra relations in one traversal.
+    """
+    async with semaphore:
+        edges = await client.abulk_create_edges(specs, batch_size=len(specs))
+    # A chained traversal only returns its last edge, and nothing if any step failed
+    if edges:
+        log.debug("Created a batch of %d relation edges in one traversal", len(specs))
+    else:
+        log.warning("Batch of %d relation edges returned nothing; some of its edges may be missing", len(specs))
+
+
+async def ingest_relations(client, relations, concurrency=INGEST_CONCURRENCY, batch_size=RELATION_BATCH_SIZE,
+                           ingested=None):
+    """
+    Ingests all relations as chained addE traversals of `batch_size` edges, with at
+    most `concurrency` traversals in flight.
+
+    The edges of a traversal run in sequence, so a relation whose source or
+    target vertex is missing loses the whole batch. Relations are loaded after
+    all assets for that reason, and when `ingested` (the ids recorded by
+    ingest_assets) is given, relations with an endpoint outside it are skipped,
+    as in bulk_load. Relations are fetched and batched on
+    a worker thread while earlier batches are being ingested (see pipeline()).
+
+    Returns:
+        int: The number of relation edges submitted.
+    """
+    def is_ingested(rel):
+        if ingested is None or (rel['source_id'] in ingested and rel['target_id'] in ingested):
+            return True
+        log.debug("Skipping relation %s -> %s: asset not ingested", rel['source_id'], rel['target_id'])
+        return False
+
+    specs = (
+        {
+            'from_vertex_id': rel['source_id'],
+            'to_vertex_id': rel['target_id'],
+            'label': 'relatedTo',
+            'properties': {'relationTypeId': rel.get('relation_type_id')},
+            # Asset vertices are partitioned by resourceType: address them with V([pk, id])
+            'from_partition_key_value': rel.get('source_resource_type'),
+            'to_partition_key_value': rel.get('target_resource_type'),
+        }
+        for rel in relations
+        if rel.get('source_id') and rel.get('target_id') and is_ingested(rel)
+    )
+    semaphore = asyncio.Semaphore(concurrency)
+    count = 0
+
+    async def handle(chunk):
+        nonlocal count
+        await ingest_relation_batch(client, chunk, semaphore)
+        count += len(chunk)
+
+    await pipeline(batched(specs, batch_size), handle, concurrency)
+    return count
+
+
+async def bulk_load(writer, assets, relations):
+    """
+    Loads assets and relations through the document endpoint instead of Gremlin.
+
+    Writes the same vertices and edges as ingest_assets and ingest_relations, but
+    as raw graph documents sent in transactional batches (see CosmosGraphBulkWriter).
+    Edge documents need the label and partition key of both vertices, so the
+    (label, partition key) of every vertex written is kept by id. Relations whose
+    source or target asset was not loaded are skipped, as their Gremlin addE would
+    find no vertex. Fetching overlaps with writing through a single-consumer
+    pipeline(), which keeps the items in order.
+
+    Returns:
+        tuple: The number of assets loaded and of relation edges queued.
+    """
+    vertices = {} # id -> (id, label, partition key value)
+    relation_count = 0
+
+    async def load_asset(asset):
+        asset_data = extract_asset_data(asset)
+        asset_id = asset_data['id']
+        label = asset_data.get('resourceType', 'Asset')
+        edge_properties = {'since': asset.get('createdOn', 'unknown')}
+        asset_vertex = vertices[asset_id] = (asset_id, label, label)
+        await writer.add_vertex(label, asset_id, asset_data, label)
+
+        for reference, keys, keys_set, default_label, edge_label in ASSET_REFERENCES:
+            if reference not in asset:
+                continue
+            spec = build_reference_spec(asset, reference, keys, keys_set, default_label, edge_label, edge_properties)
+            reference_vertex = vertices.get(spec['id_value'])
+            if reference_vertex is None:
+                reference_vertex = vertices[spec['id_value']] = (spec['id_value'], spec['label'], spec['partition_key_value'])
+                await writer.add_vertex(spec['label'], spec['id_value'], spec['properties'], spec['partition_key_value'])
+            await writer.add_edge(edge_label, reference_vertex, asset_vertex, edge_properties)
+
+    async def load_relation(rel):
+        nonlocal relation_count
+        source = vertices.get(rel.get('source_id'))
+        target = vertices.get(rel.get('target_id'))
+        if source is None or target is None:
+            log.debug("Skipping relation %s -> %s: asset not loaded", rel.get('source_id'), rel.get('target_id'))
+            return
+        await writer.add_edge('relatedTo', source, target, {'relationTypeId': rel.get('relation_type_id')})
+        relation_count += 1
+
+    async with writer:
+        asset_count = await pipeline(assets, load_asset, 1)
+        await pipeline(relations, load_relation, 1)
+    return asset_count, relation_count
+
 
 if __name__ == "__main__":
+    load_dotenv()  # Load environment variables from .env file
+    # Configure logging for gremlinpython to see connection details and query execution
+    logging.basicConfig(level=logging.INFO)
+
+    parser = argparse.ArgumentParser(description="Load Collibra assets and relations into a Cosmos DB graph.")
+    parser.add_argument("--clean", action="store_true", help="Drop all existing vertices before loading.")
+    parser.add_argument("--bulk", action="store_true",
+                        help="Write the initial load as documents through the SQL endpoint instead of Gremlin.")
+    args = parser.parse_args()
+
     # --- Configuration ---
     # IMPORTANT: Replace these with your actual Cosmos DB Gremlin API details
     # You can find these in your Azure Portal -> Cosmos DB Account -> Keys
@@ -27,6 +417,8 @@ if __name__ == "__main__":
     COSMOS_DB_PASSWORD = os.getenv("COSMOS_DB_PASSWORD")
     COSMOS_DB_PORT = int(os.getenv("COSMOS_DB_PORT", 443))
     COSMOSDB_PARTITION_KEY_FIELD = os.getenv("COSMOSDB_PARTITION_KEY_FIELD", "resourceType")
+    # Document (SQL) endpoint used by --bulk; derived from the Gremlin hostname when unset
+    COSMOS_DB_ENDPOINT = os.getenv("COSMOS_DB_ENDPOINT")
 
 
     if "YOUR_COSMOS_DB_HOSTNAME" in COSMOS_DB_HOSTNAME or \
@@ -39,258 +431,156 @@ if __name__ == "__main__":
         # Exit if placeholders are still present to prevent connection errors
         # exit() # Uncomment this line if you want the script to exit immediately
 
-    client = None
+    # One pooled HTTP session carries every Collibra request of the run, so the
+    # asset and relation fetches reuse the same keep-alive TLS connections
+    session = get_session()
+
     try:
-        # 1. Initialize the client
-        client = CosmosGraphClient(
-            hostname=COSMOS_DB_HOSTNAME,
-            port=COSMOS_DB_PORT,
-            database_name=COSMOS_DB_DATABASE_NAME, # Pass database name
-            collection_name=COSMOS_DB_COLLECTION_NAME, # Pass collection name
-            password=COSMOS_DB_PASSWORD,
-            partition_key_field=COSMOSDB_PARTITION_KEY_FIELD, # Optional: Specify partition key field
-        )
-
-        # 2. Connect to the database
-        client.connect()
-
-        # 3. Clean up existing data (optional, for testing)
-        print("\n--- Cleaning up existing data (optional) ---")
-        # client.run_query("g.V().drop()")
-        drop_limit = 10
-        # Drop vertices in batches to avoid overwhelming the server
-        print(f"Dropping vertices in batches of {drop_limit}...")
-        while True:
-            # Check if there are more vertices to drop
-            remaining = client.run_query("g.V().count()")[0]
-            print(f"Remaining vertices to drop: {remaining}")
-            if remaining == 0:
-                break
-            client.run_query(f"g.V().limit({drop_limit}).drop()")
-        print("Existing data cleaned up.")
-
-        # 4. Fetch Collibra Assets
-        print("\n--- Fetching Collibra Assets ---")
-        all_assets = get_all_collibra_assets_basic_auth()
-        if all_assets:
-            print(f"Retrieved {len(all_assets)} assets from Collibra.")
-        else:
-            print("No assets retrieved or an error occurred.")
-
-        # 5. Create vertices for all the assets
-        asset_keys_to_extract = ['id', 'createdBy', 'createdOn', 'lastModifiedBy', 'lastModifiedOn', 'system', 'resourceType', 'name', 'displayName', 'articulationScore', 'excludedFromAutoHyperlinking', 'avgRating', 'ratingsCount']
-        domain_keys_to_extract = ['id', 'resourceType', 'resourceDiscriminator', 'name']
-        type_keys_to_extract = ['id', 'resourceType', 'resourceDiscriminator', 'name']
-        status_keys_to_extract = ['id', 'resourceType', 'resourceDiscriminator', 'name']
-        print("\n--- Creating Vertices for Collibra Assets ---")
-        # Iterate through all assets and create vertices for each
-        for asset in all_assets:
-            asset_data = {}
-            domain_data = {}
-            type_data = {}
-            status_data = {}
-
-
-            for key in asset_keys_to_extract:
-                try:
-                    asset_data[key] = asset[key]
-                except KeyError:
-                    print(f"Warning: Key '{key}' not found in the original dictionary. Skipping.")
-            print(f"Asset Data: {asset_data}")
-
-            print("\n--- Creating Vertices for Collibra Assets ---")
-            asset_vertex = client.create_vertex(
-                label=asset_data.get('resourceType', 'Asset'),  # Use resourceType as label, default to 'Asset'
-                properties=asset_data
-            )
-            print(f"Created Collibra Asset Vertex: {asset_vertex}")
-            
-            if 'domain' in asset:
-                for key in domain_keys_to_extract:
-                    try:
-                        domain_data[key] = asset['domain'][key]
-                    except KeyError:
-                        print(f"Warning: Key '{key}' not found in the domain dictionary. Skipping.")
-                print(f"Domain Data: {domain_data}")
-
-                # Create Domain Vertex
-                domain_vertex = client.upsert_vertex(
-                    label=domain_data.get('resourceType', 'Domain'),
-                    id_value=domain_data.get('id'),
-                    unique_property_name='id',
-                    unique_property_value=domain_data.get('id'),
-                    properties=domain_data
-                )
-                print(f"Created Domain Vertex: {domain_vertex}")
-                print(f"Creating Edge from Domain to Asset: {asset['id']} with Domain Vertex ID: {domain_vertex['id']}")
-                domain_edge = client.create_edge(
-                    from_vertex_id=domain_vertex['id'],
-                    to_vertex_id=asset['id'],  # Assuming asset['id'] is the ID of the asset vertex
-                    label='belongsTo_domain',
-                    properties={'since': asset.get('createdOn', 'unknown')}
-                )
-                print(f"Created Edge from Domain to Asset: {domain_edge}")
-
-            if 'type' in asset:
-                for key in type_keys_to_extract:
-                    try:
-                        type_data[key] = asset['type'][key]
-                    except KeyError:
-                        print(f"Warning: Key '{key}' not found in the type dictionary. Skipping.")
-                print(f"Type Data: {type_data}")
-
-                # Create Type Vertex
-                type_vertex = client.upsert_vertex(
-                    label=type_data.get('resourceType', 'Type'),
-                    id_value=type_data.get('id'),
-                    unique_property_name='id',
-                    unique_property_value=type_data.get('id'),
-                    properties=type_data
-                )
-                print(f"Created Type Vertex: {type_vertex}")
-                print(f"Creating Edge from Type to Asset: {asset['id']} with Type Vertex ID: {type_vertex['id']}")
-                type_edge = client.create_edge(
-                    from_vertex_id=type_vertex['id'],
-                    to_vertex_id=asset['id'],  # Assuming asset['id'] is the ID of the asset vertex
-                    label='belongsTo_type',
-                    properties={'since': asset.get('createdOn', 'unknown')}
-                )
-                print(f"Created Edge from Type to Asset: {type_edge}")
-
-            if 'status' in asset:
-                for key in status_keys_to_extract:
-                    try:
-                        status_data[key] = asset['status'][key]
-                    except KeyError:
-                        print(f"Warning: Key '{key}' not found in the status dictionary. Skipping.")
-                print(f"Status Data: {status_data}")
-
-                # Create Status Vertex
-                status_vertex = client.upsert_vertex(
-                    label=status_data.get('resourceType', 'Status'),
-                    id_value=status_data.get('id'),
-                    unique_property_name='id',
-                    unique_property_value=status_data.get('id'),
-                    properties=status_data
-                )
-                print(f"Created Status Vertex: {status_vertex}")
-                print(f"Creating Edge from Status to Asset: {asset['id']} with Status Vertex ID: {status_vertex['id']}")
-                status_edge = client.create_edge(
-                    from_vertex_id=status_vertex['id'],
-                    to_vertex_id=asset['id'],  # Assuming asset['id'] is the ID of the asset vertex
-                    label='belongsTo_status',
-                    properties={'since': asset.get('createdOn', 'unknown')}
-                )
-                print(f"Created Edge from Status to Asset: {status_edge}")
-
-        # 5. Fetch Collibra Relations
-        print("\n--- Fetching Collibra Relations ---")
-        all_relations = get_all_collibra_relations()
-        if all_relations:
-            print(f"Retrieved {len(all_relations)} relationships from Collibra.")
-            for rel in all_relations:
-                source_id = rel.get('source_id')
-                target_id = rel.get('target_id')
-                relation_type_id = rel.get('relation_type_id')
-
-                if source_id and target_id:
-                    print(f"Creating Edge from Source ID: {source_id} to Target ID: {target_id} with Relation Type ID: {relation_type_id}")
-                    edge = client.create_edge(
-                        from_vertex_id=source_id,
-                        to_vertex_id=target_id,
-                        label='relatedTo',
-                        properties={'relationTypeId': relation_type_id}
+        # Gremlin is only needed for --clean and for the default (non --bulk) load
+        if args.clean or not args.bulk:
+            # 1. Initialize the client and 2. connect to the database. The WebSocket pool is
+            # opened once, every query of the run is leased a socket from it, and leaving
+            # the with block (even on Ctrl+C) closes it
+            with CosmosGraphClient(
+                hostname=COSMOS_DB_HOSTNAME,
+                port=COSMOS_DB_PORT,
+                database_name=COSMOS_DB_DATABASE_NAME, # Pass database name
+                collection_name=COSMOS_DB_COLLECTION_NAME, # Pass collection name
+                password=COSMOS_DB_PASSWORD,
+                partition_key_field=COSMOSDB_PARTITION_KEY_FIELD, # Optional: Specify partition key field
+                pool_size=INGEST_CONCURRENCY, # One WebSocket per concurrent ingestion request
+            ) as client:
+                # 3. Clean up existing data (optional, for testing)
+                if args.clean:
+                    print("\n--- Cleaning up existing data ---")
+                    if drop_all_vertices(client):
+                        print("Existing data cleaned up.")
+                    else:
+                        print("Could not clean up all existing data; see the log for the failed requests.")
+
+                if not args.bulk:
+                    ingested = set() # Ids of the assets written, so relations skip missing endpoints
+
+                    # 4. Fetch Collibra Assets and create vertices for them as they stream in
+                    print("\n--- Fetching Collibra Assets and Creating Vertices ---")
+                    asset_count = asyncio.run(ingest_assets(client, iter_collibra_assets(session), ingested=ingested))
+                    if asset_count:
+                        print(f"Ingested {asset_count} assets from Collibra.")
+                    else:
+                        print("No assets retrieved or an error occurred.")
+
+                    # 5. Fetch Collibra Relations and create edges for them as they stream in
+                    print("\n--- Fetching Collibra Relations ---")
+                    relation_count = asyncio.run(
+                        ingest_relations(client, iter_collibra_relations(session), ingested=ingested)
                     )
-                    print(f"Created Edge: {edge}")
-        else:
-            print("No relationships found.")
-
-
-
-
-
-
-
-
-
-
-
-
-
-
-        # 4. Create Vertices
-        # print("\n--- Creating Vertices ---")
-        # person1 = client.create_vertex(
-        #     label='person',
-        #     properties={'name': 'Alice', 'age': 30, 'city': 'New York', 'resourceType':'Asset'}
-        # )
-        # print(f"Created person: {person1}")
-        # alice_id = person1[0]['id'] if person1 else None
-
-        # person2 = client.create_vertex(
-        #     label='person',
-        #     properties={'name': 'Bob', 'age': 25, 'city': 'London', 'resourceType':'Asset'}
-        # )
-        # print(f"Created person: {person2}")
-        # bob_id = person2[0]['id'] if person2 else None
-
-        # city1 = client.create_vertex(
-        #     label='city',
-        #     properties={'name': 'New York', 'country': 'USA', 'resourceType':'Asset'}
-        # )
-        # print(f"Created city: {city1}")
-        # new_york_id = city1[0]['id'] if city1 else None
-
-        # # 5. Create Edges
-        # print("\n--- Creating Edges ---")
-        # if alice_id and bob_id:
-        #     edge1 = client.create_edge(
-        #         from_vertex_id=alice_id,
-        #         to_vertex_id=bob_id,
-        #         label='knows',
-        #         properties={'since': 2020}
-        #     )
-        #     print(f"Created edge (Alice knows Bob): {edge1}")
-        # else:
-        #     print("Could not create 'knows' edge: Alice or Bob vertex ID missing.")
-
-        # if alice_id and new_york_id:
-        #     edge2 = client.create_edge(
-        #         from_vertex_id=alice_id,
-        #         to_vertex_id=new_york_id,
-        #         label='livesIn'
-        #     )
-        #     print(f"Created edge (Alice lives in New York): {edge2}")
-        # else:
-        #     print("Could not create 'livesIn' edge: Alice or New York vertex ID missing.")
-
-        # # 6. Run Arbitrary Queries
-        # print("\n--- Running Arbitrary Queries ---")
-
-        # # Get all vertices
-        # all_vertices = client.run_query("g.V()")
-        # print("\nAll Vertices:")
-        # for v in all_vertices:
-        #     print(v)
-
-        # # Get all edges
-        # all_edges = client.run_query("g.E()")
-        # print("\nAll Edges:")
-        # for e in all_edges:
-        #     print(e)
-
-        # # Find people older than 28
-        # older_people = client.run_query("g.V().hasLabel('person').has('age', gt(28))")
-        # print("\nPeople older than 28:")
-        # for p in older_people:
-        #     print(p)
-
-        # # Find who Alice knows
-        # alice_knows = client.run_query(f"g.V('{alice_id}').out('knows')")
-        # print(f"\nWho Alice knows:")
-        # for p in alice_knows:
-        #     print(p)
-
+                    if relation_count:
+                        print(f"Ingested {relation_count} relationships from Collibra.")
+                    else:
+                        print("No relationships found.")
+
+
+
+
+
+
+
+
+
+
+
+
+
+
+                # 4. Create Vertices
+                # print("\n--- Creating Vertices ---")
+                # person1 = client.create_vertex(
+                #     label='person',
+                #     properties={'name': 'Alice', 'age': 30, 'city': 'New York', 'resourceType':'Asset'}
+                # )
+                # print(f"Created person: {person1}")
+                # alice_id = person1[0]['id'] if person1 else None
+
+                # person2 = client.create_vertex(
+                #     label='person',
+                #     properties={'name': 'Bob', 'age': 25, 'city': 'London', 'resourceType':'Asset'}
+                # )
+                # print(f"Created person: {person2}")
+                # bob_id = person2[0]['id'] if person2 else None
+
+                # city1 = client.create_vertex(
+                #     label='city',
+                #     properties={'name': 'New York', 'country': 'USA', 'resourceType':'Asset'}
+                # )
+                # print(f"Created city: {city1}")
+                # new_york_id = city1[0]['id'] if city1 else None
+
+                # # 5. Create Edges
+                # print("\n--- Creating Edges ---")
+                # if alice_id and bob_id:
+                #     edge1 = client.create_edge(
+                #         from_vertex_id=alice_id,
+                #         to_vertex_id=bob_id,
+                #         label='knows',
+                #         properties={'since': 2020}
+                #     )
+                #     print(f"Created edge (Alice knows Bob): {edge1}")
+                # else:
+                #     print("Could not create 'knows' edge: Alice or Bob vertex ID missing.")
+
+                # if alice_id and new_york_id:
+                #     edge2 = client.create_edge(
+                #         from_vertex_id=alice_id,
+                #         to_vertex_id=new_york_id,
+                #         label='livesIn'
+                #     )
+                #     print(f"Created edge (Alice lives in New York): {edge2}")
+                # else:
+                #     print("Could not create 'livesIn' edge: Alice or New York vertex ID missing.")
+
+                # # 6. Run Arbitrary Queries
+                # print("\n--- Running Arbitrary Queries ---")
+
+                # # Get all vertices
+                # all_vertices = client.run_query("g.V()")
+                # print("\nAll Vertices:")
+                # for v in all_vertices:
+                #     print(v)
+
+                # # Get all edges
+                # all_edges = client.run_query("g.E()")
+                # print("\nAll Edges:")
+                # for e in all_edges:
+                #     print(e)
+
+                # # Find people older than 28
+                # older_people = client.run_query("g.V().hasLabel('person').has('age', gt(28))")
+                # print("\nPeople older than 28:")
+                # for p in older_people:
+                #     print(p)
+
+                # # Find who Alice knows
+                # alice_knows = client.run_query(f"g.V('{alice_id}').out('knows')")
+                # print(f"\nWho Alice knows:")
+                # for p in alice_knows:
+                #     print(p)
+            print("\nConnection closed.")
+
+        if args.bulk:
+            # 4. Stream Collibra Assets and Relations into the graph as documents
+            print("\n--- Bulk Loading Collibra Assets and Relations ---")
+            writer = CosmosGraphBulkWriter(
+                endpoint=COSMOS_DB_ENDPOINT or document_endpoint(COSMOS_DB_HOSTNAME),
+                key=COSMOS_DB_PASSWORD,
+                database_name=COSMOS_DB_DATABASE_NAME,
+                collection_name=COSMOS_DB_COLLECTION_NAME,
+                partition_key_field=COSMOSDB_PARTITION_KEY_FIELD,
+            )
+            asset_count, relation_count = asyncio.run(
+                bulk_load(writer, iter_collibra_assets(session), iter_collibra_relations(session))
+            )
+            print(f"Loaded {asset_count} assets and {relation_count} relationships from Collibra "
+                  f"({writer.written} documents written, {writer.failed} failed).")
     except Exception as e:
         print(f"An error occurred during the example execution: {e}")
         print(f"  Error Type: {type(e).__name__}")
@@ -302,9 +592,4 @@ if __name__ == "__main__":
             if e.status_code == 401:
                 print("Check your master key and host settings.")
             elif e.status_code == 404:
-                print("Check if the database or graph name is correct.")
-    finally:
-        # 7. Close the connection
-        if client:
-            client.close()
-            print("\nConnection closed.")
\ No newline at end of file
+                print("Check if the database or graph name is correct.")
\ No newline at end of file